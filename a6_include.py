@@ -5,6 +5,9 @@
 #              are available and how they're implemented.
 #              Don't modify the contents of this file.
 
+import struct
+from hashlib import blake2b as _blake2b
+
 
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
@@ -19,6 +22,8 @@ class DynamicArray:
     append, pop, swap, get_at_index, set_at_index, length
     """
 
+    __slots__ = ('_data',)
+
     def __init__(self, arr=None) -> None:
         """Initialize new dynamic array using a list."""
         self._data = arr.copy() if arr else []
@@ -55,7 +60,7 @@ class DynamicArray:
 
     def get_at_index(self, index: int):
         """Return value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         return self._data[index]
 
@@ -65,7 +70,7 @@ class DynamicArray:
 
     def set_at_index(self, index: int, value: object) -> None:
         """Set value of element at a given index."""
-        if index < 0 or index >= self.length():
+        if index < 0 or index >= len(self._data):
             raise DynamicArrayException
         self._data[index] = value
 
@@ -77,6 +82,37 @@ class DynamicArray:
         """Return length of array."""
         return len(self._data)
 
+    # The methods below skip the bounds checks. They are meant for the
+    # hash maps' internal loops, which only use indices known to be valid.
+
+    @classmethod
+    def filled(cls, length: int, value: object = None) -> "DynamicArray":
+        """
+        Return a new array of the given length with every element set to value.
+        Every element refers to the same value object.
+        """
+        array = cls()
+        array._data = [value] * length
+        return array
+
+    def get_unchecked(self, index: int):
+        """Return value of element at a given index, which must be in range."""
+        return self._data[index]
+
+    def set_unchecked(self, index: int, value: object) -> None:
+        """Set value of element at a given index, which must be in range."""
+        self._data[index] = value
+
+    def resize(self, length: int, value: object = None) -> None:
+        """
+        Grow or shrink the array to the given length in one step.
+        New elements are set to value.
+        """
+        if length < len(self._data):
+            del self._data[length:]
+        else:
+            self._data.extend([value] * (length - len(self._data)))
+
 
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
@@ -96,6 +132,54 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+_MASK_64 = (1 << 64) - 1
+_SEED = struct.Struct('<Q')
+
+
+def hash_function_builtin(key: str) -> int:
+    """
+    Hash function using Python's built-in hash, made non-negative.
+    The fastest choice, but string hashes are randomized for every
+    Python process (see PYTHONHASHSEED), so the hashes must not be
+    shared between processes.
+    """
+    return hash(key) & _MASK_64
+
+
+def hash_function_blake2b(key: str) -> int:
+    """
+    64-bit hash function over the key's UTF-8 bytes, taken from an
+    8-byte BLAKE2b digest. Well distributed, and the same in every
+    Python process, which hash_function_builtin is not. It costs
+    about 1 us per call on a short key, ten times as much as
+    hash_function_builtin and twice as much as hash_function_1; the
+    digest runs in C, so it barely slows down on long keys.
+    """
+    return int.from_bytes(_blake2b(key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class SeededHashFunction:
+    """
+    Seeded variant of hash_function_blake2b. Maps built with different
+    seeds place the same keys in unrelated buckets. The seed makes each
+    call cost about a quarter more. Instances can be passed anywhere a
+    hash function is expected.
+    """
+
+    def __init__(self, seed: int) -> None:
+        """Initialize the hash function with a seed."""
+        self.seed = seed
+        self._salt = _SEED.pack(seed & _MASK_64) # the BLAKE2b salt
+
+    def __call__(self, key: str) -> int:
+        """Return the hash of the given key."""
+        return int.from_bytes(_blake2b(key.encode('utf-8'), digest_size=8, salt=self._salt).digest(), 'little')
+
+    def __repr__(self) -> str:
+        """Override repr method to provide more readable output."""
+        return f"SeededHashFunction({self.seed})"
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -103,11 +187,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None,
+                 hash: int = None) -> None:
+        """Initialize node given a key, value and the key's hash."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -119,6 +207,8 @@ class LinkedListIterator:
     Separate iterator class for LinkedList
     """
 
+    __slots__ = ('_node',)
+
     def __init__(self, current_node: SLNode) -> None:
         """Initialize the iterator with a node."""
         self._node = current_node
@@ -144,6 +234,8 @@ class LinkedList:
     Supported methods are: insert, remove, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -168,20 +260,35 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    @classmethod
+    def from_chain(cls, head: SLNode, size: int) -> "LinkedList":
+        """Return a new list holding a chain of size nodes that are already linked, starting at head."""
+        linked_list = cls()
+        linked_list._head = head
+        linked_list._size = size
+        return linked_list
+
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node at front of the list."""
+        node.next = self._head
+        self._head = node
+        self._size += 1
+
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        If the key's hash is given, it is compared before the key.
         Return True if removal was successful, False otherwise.
         """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
@@ -192,11 +299,14 @@ class LinkedList:
             previous, node = node, node.next
         return False
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        If the key's hash is given, it is compared before the key.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -210,10 +320,13 @@ class LinkedList:
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    __slots__ = ('key', 'value', 'hash', 'is_tombstone')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, given the key's hash."""
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -221,3 +334,209 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ------ Iterators and views, used by both HashMaps (SC & OA) ------ #
+
+class HashMapIterator:
+    """
+    Separate iterator class for the HashMaps, over buckets that are either
+    LinkedLists of SLNodes (SC) or HashEntry objects and None (OA)
+    """
+
+    __slots__ = ('_map', '_buckets', '_capacity', '_index', '_nodes', '_version', '_kind',
+                 '_old_buckets', '_old_capacity', '_old_index', '_seen')
+
+    def __init__(self, hash_map, kind: str = None) -> None:
+        """
+        Initialize the iterator given a hash map and what it produces:
+        'keys', 'values', 'items' (key/value tuples), or None for the
+        SLNodes or hash entries themselves. An incremental resize in progress
+        is left alone: the old table's buckets that haven't been moved yet are
+        walked first, and then the new table.
+        """
+        self._map = hash_map
+        self._buckets = hash_map._buckets
+        self._capacity = hash_map._capacity
+        self._index = 0 # the next bucket to look at
+        self._nodes = None # iterator over the linked list of the bucket being walked
+        self._version = hash_map._version # changes whenever a key/value pair is added or removed
+        self._kind = kind
+        self._old_buckets = hash_map._old_buckets # the old table of an incremental resize in progress, or None
+        self._old_capacity = hash_map._old_capacity
+        self._old_index = hash_map._migrate_index # the next old bucket to look at
+        # ids of the items produced from the old table, which lookups may move into the new table before it is walked
+        self._seen = set() if self._old_buckets is not None else None
+
+    def __iter__(self) -> "HashMapIterator":
+        """Return the iterator itself."""
+        return self
+
+    def __next__(self):
+        """
+        Obtain the next key/value pair and advance the iterator. Raise
+        RuntimeError if the hash map has been changed since the iterator
+        was created, since its buckets may have been moved or rebuilt.
+        """
+        if self._map._version != self._version:
+            raise RuntimeError('HashMap changed during iteration')
+        if self._seen is not None:
+            return self._next_migrating()
+        if self._nodes is not None: # keep walking the linked list of the current bucket
+            node = next(self._nodes, None)
+            if node is not None:
+                return self._produce(node)
+            self._nodes = None
+
+        buckets = self._buckets
+        index = self._index
+        while index < self._capacity: # find the next bucket that contains an active key/value pair
+            bucket = buckets.get_unchecked(index)
+            index += 1
+            if bucket is None: # an empty open addressing bucket
+                continue
+            if type(bucket) is LinkedList:
+                if bucket.length() != 0: # skip the empty chains
+                    self._index = index
+                    self._nodes = iter(bucket)
+                    return self._produce(next(self._nodes))
+            elif bucket.is_tombstone is False:
+                self._index = index
+                return self._produce(bucket)
+        self._index = index
+        raise StopIteration
+
+    def _next_migrating(self):
+        """
+        Obtain the next key/value pair while an incremental resize was in progress when the
+        iterator was created. get and contains_key keep moving old buckets into the new table,
+        so the old buckets that have been moved are skipped, and the items already produced
+        from the old table are skipped once they turn up in the new table.
+        """
+        seen = self._seen
+        while True:
+            if self._nodes is not None: # keep walking the items of the current bucket
+                for item in self._nodes:
+                    if self._old_buckets is not None:
+                        seen.add(id(item))
+                        return self._produce(item)
+                    if id(item) not in seen:
+                        return self._produce(item)
+                self._nodes = None
+
+            if self._old_buckets is not None:
+                bucket = self._next_old_bucket()
+                if bucket is None: # every old bucket has been walked or moved, so walk the new table
+                    self._old_buckets = None
+                    continue
+                if type(bucket) is LinkedList:
+                    self._nodes = iter(list(bucket)) # moving the bucket would relink its nodes under a linked list iterator
+                else:
+                    self._nodes = iter((bucket,))
+                continue
+
+            buckets = self._buckets
+            index = self._index
+            while index < self._capacity: # find the next bucket that contains an active key/value pair
+                bucket = buckets.get_unchecked(index)
+                index += 1
+                if bucket is None:
+                    continue
+                if type(bucket) is LinkedList:
+                    if bucket.length() != 0:
+                        self._nodes = iter(bucket)
+                        break
+                elif bucket.is_tombstone is False:
+                    self._nodes = iter((bucket,))
+                    break
+            self._index = index
+            if self._nodes is None:
+                raise StopIteration
+
+    def _next_old_bucket(self):
+        """
+        Return the next old bucket that holds an active key/value pair and hasn't
+        been moved into the new table yet, or None if there are no more.
+        """
+        hash_map = self._map
+        old_buckets = self._old_buckets
+        while self._old_index < self._old_capacity:
+            if hash_map._old_buckets is not old_buckets: # the resize has finished, so every old bucket has been moved
+                return None
+            if self._old_index < hash_map._migrate_index: # skip the buckets moved since the last step
+                self._old_index = hash_map._migrate_index
+                continue
+            bucket = old_buckets.get_unchecked(self._old_index)
+            self._old_index += 1
+            if bucket is None:
+                continue
+            if type(bucket) is LinkedList:
+                if bucket.length() != 0:
+                    return bucket
+            elif bucket.is_tombstone is False:
+                return bucket
+        return None
+
+    def _produce(self, item):
+        """Return what the iterator produces for the given SLNode or hash entry."""
+        kind = self._kind
+        if kind is None:
+            return item
+        if kind == 'keys':
+            return item.key
+        if kind == 'values':
+            return item.value
+        return item.key, item.value
+
+
+class HashMapView:
+    """
+    Lazy view of the keys, values or key/value pairs of a HashMap
+    """
+
+    __slots__ = ('_map', '_kind')
+
+    def __init__(self, hash_map, kind: str) -> None:
+        """
+        Initialize the view given a hash map and what it produces:
+        'keys', 'values' or 'items' (key/value tuples). The view holds
+        no copy of the hash map, so it always reflects its current contents.
+        """
+        self._map = hash_map
+        self._kind = kind
+
+    def __iter__(self) -> HashMapIterator:
+        """Return a new iterator over the hash map."""
+        return HashMapIterator(self._map, self._kind)
+
+    def __len__(self) -> int:
+        """Return the number of key/value pairs in the hash map."""
+        return self._map.get_size()
+
+    def __contains__(self, item: object) -> bool:
+        """
+        Keys and key/value tuples are looked up in the hash map,
+        while a value has to be searched for by walking the view.
+        Like a dict's items view, the items view only holds tuples
+        of two.
+        """
+        if self._kind == 'keys':
+            return self._map.contains_key(item)
+        if self._kind == 'items':
+            if not isinstance(item, tuple) or len(item) != 2:
+                return False
+            key, value = item
+            found = self._map.get(key)
+            if found is None and value is None: # get can't tell a missing key from a value of None
+                return self._map.contains_key(key)
+            return found == value
+        for value in self:
+            if value == item:
+                return True
+        return False
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return self._kind + '([' + ', '.join(str(item) for item in self) + '])'
@@ -0,0 +1,69 @@
+# Description: Benchmark comparing the batch methods (put_many, get_many, contains_many and
+# remove_many) with loops over the single key methods, for both hash maps. Every map starts at
+# the default small capacity, so the put loop pays for every resize on the way up while put_many
+# presizes the table once.
+#
+# Run from the repository root:  python -m benchmarks.bench_batch [--size 200000]
+
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_sc
+
+
+def timed(function, *args) -> float:
+    """Call the function with the given arguments and return the seconds it took."""
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def put_loop(m, pairs: list) -> None:
+    for key, value in pairs:
+        m.put(key, value)
+
+
+def get_loop(m, keys: list) -> None:
+    for key in keys:
+        m.get(key)
+
+
+def contains_loop(m, keys: list) -> None:
+    for key in keys:
+        m.contains_key(key)
+
+
+def remove_loop(m, keys: list) -> None:
+    for key in keys:
+        m.remove(key)
+
+
+def run(module, pairs: list, keys: list) -> list:
+    """Return (operation, loop seconds, batch seconds) rows for one hash map module."""
+    loop_map = module.HashMap(11, hash)
+    batch_map = module.HashMap(11, hash)
+    return [
+        ('put', timed(put_loop, loop_map, pairs), timed(batch_map.put_many, pairs)),
+        ('get', timed(get_loop, loop_map, keys), timed(batch_map.get_many, keys)),
+        ('contains', timed(contains_loop, loop_map, keys), timed(batch_map.contains_many, keys)),
+        ('remove', timed(remove_loop, loop_map, keys), timed(batch_map.remove_many, keys)),
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Batch methods against loops over the single key methods')
+    parser.add_argument('--size', type=int, default=200000)
+    args = parser.parse_args()
+
+    pairs = [('key' + str(i), i) for i in range(args.size)]
+    keys = [key for key, _ in pairs]
+
+    print(f"{'map':>4} {'operation':>10} {'loop s':>8} {'batch s':>8} {'speedup':>8}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for operation, loop_time, batch_time in run(module, pairs, keys):
+            print(f"{name:>4} {operation:>10} {loop_time:>8.3f} {batch_time:>8.3f} {loop_time / batch_time:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
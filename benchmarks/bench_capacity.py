@@ -0,0 +1,77 @@
+# Description: Benchmark for choosing table capacities. For a range of requested capacities, the
+# benchmark times the capacity planner's Miller-Rabin next_prime against the trial division search
+# the HashMap classes used before, and a lookup in a precomputed table of roughly doubling primes,
+# which the HashMaps don't use, since put asks for exactly double the capacity. It also checks that
+# both prime searches return the same capacity.
+#
+# Run from the repository root:  python -m benchmarks.bench_capacity [--repeat 20]
+
+import argparse
+import time
+from bisect import bisect_left
+
+from capacity_planner import next_prime
+
+# primes that roughly double from one to the next, each one far from the neighbouring powers of two
+GROWTH_PRIMES = (
+    3, 7, 13, 29, 53, 97, 193, 389, 769, 1543, 3079, 6151, 12289, 24593, 49157, 98317, 196613,
+    393241, 786433, 1572869, 3145739, 6291469, 12582917, 25165843, 50331653, 100663319, 201326611,
+    402653189, 805306457, 1610612741, 3221225473,
+)
+
+
+def growth_prime(capacity: int) -> int:
+    """Return the smallest prime in GROWTH_PRIMES at least the capacity, or next_prime beyond the table."""
+    index = bisect_left(GROWTH_PRIMES, capacity)
+    if index < len(GROWTH_PRIMES):
+        return GROWTH_PRIMES[index]
+    return next_prime(capacity)
+
+
+def trial_division_is_prime(capacity: int) -> bool:
+    """The primality test the HashMap classes used before the capacity planner."""
+    if capacity == 2 or capacity == 3:
+        return True
+    if capacity == 1 or capacity % 2 == 0:
+        return False
+    factor = 3
+    while factor ** 2 <= capacity:
+        if capacity % factor == 0:
+            return False
+        factor += 2
+    return True
+
+
+def trial_division_next_prime(capacity: int) -> int:
+    """The prime search the HashMap classes used before the capacity planner."""
+    if capacity % 2 == 0:
+        capacity += 1
+    while not trial_division_is_prime(capacity):
+        capacity += 2
+    return capacity
+
+
+def timed(function, capacity: int, repeat: int) -> float:
+    """Return the mean time in microseconds of calling function(capacity)."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(capacity)
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Prime capacity selection benchmark')
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'requested':>12} {'prime':>12} {'trial us':>10} {'planner us':>11} {'table us':>9}")
+    for exponent in range(1, 28, 3):
+        requested = 11 * 2 ** exponent # the doubled capacities put asks for, starting from the default capacity
+        prime = next_prime(requested)
+        assert prime == trial_division_next_prime(requested)
+        print(f"{requested:>12} {prime:>12} {timed(trial_division_next_prime, requested, args.repeat):>10.1f} "
+              f"{timed(next_prime, requested, args.repeat):>11.1f} {timed(growth_prime, requested, args.repeat):>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
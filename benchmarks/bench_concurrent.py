@@ -0,0 +1,86 @@
+# Description: Multi-threaded throughput benchmark for the striped-lock ConcurrentHashMap. Each thread
+# runs the same mix of gets and puts over its own keys, and the total operations per second are
+# reported for a growing number of threads. The separate chaining HashMap guarded by a single global
+# lock is run alongside as the baseline. With the GIL only one thread runs Python code at a time, so
+# the numbers mostly show how much each design's locking costs; on a free-threaded (no-GIL) build of
+# CPython the striped map's throughput can also grow with the number of threads. The header line
+# says which kind of interpreter ran the benchmark.
+#
+# Run from the repository root:  python -m benchmarks.bench_concurrent [--ops 200000] [--threads 1 2 4 8]
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+import hash_map_sc
+from a6_include import hash_function_builtin
+from hash_map_concurrent import ConcurrentHashMap
+
+
+class GlobalLockHashMap:
+    """The separate chaining HashMap with every operation under one lock."""
+
+    def __init__(self) -> None:
+        self._map = hash_map_sc.HashMap(11, hash_function_builtin)
+        self._lock = threading.Lock()
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._map.put(key, value)
+
+    def get(self, key):
+        with self._lock:
+            return self._map.get(key)
+
+
+def worker(m, keys: list, writes: list, barrier: threading.Barrier) -> None:
+    barrier.wait()
+    for key, write in zip(keys, writes):
+        if write:
+            m.put(key, key)
+        else:
+            m.get(key)
+
+
+def run(make_map, threads: int, ops: int, write_ratio: float) -> float:
+    """Return the operations per second of the given number of threads sharing one map."""
+    m = make_map()
+    per_thread = ops // threads
+    rng = random.Random(threads)
+    work = []
+    for t in range(threads):
+        keys = [(t, rng.randrange(per_thread)) for _ in range(per_thread)]
+        writes = [rng.random() < write_ratio for _ in range(per_thread)]
+        work.append((keys, writes))
+
+    barrier = threading.Barrier(threads + 1)
+    pool = [threading.Thread(target=worker, args=(m, keys, writes, barrier)) for keys, writes in work]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return per_thread * threads / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Threaded throughput of the striped-lock HashMap')
+    parser.add_argument('--ops', type=int, default=200000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if gil else 'disabled (free-threaded)'}")
+    print(f"{'threads':>8} {'global lock ops/s':>18} {'striped ops/s':>14} {'ratio':>6}")
+    for threads in args.threads:
+        baseline = run(GlobalLockHashMap, threads, args.ops, args.write_ratio)
+        striped = run(lambda: ConcurrentHashMap(11, hash_function_builtin), threads, args.ops, args.write_ratio)
+        print(f"{threads:>8} {baseline:>18,.0f} {striped:>14,.0f} {striped / baseline:>6.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# Description: Microbenchmark for DynamicArray's unchecked access path. The first table times
+# single element reads and writes through the checked methods and the unchecked ones, and filling
+# an array of empty buckets by appending against DynamicArray.filled. The second table times the
+# hash maps' get and put with their internal loops using the unchecked methods, and again with the
+# checked methods patched in their place.
+#
+# Run from the repository root:  python -m benchmarks.bench_dynamic_array [--size 100000]
+
+import argparse
+import contextlib
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import DynamicArray
+
+
+def per_op(function, count: int) -> float:
+    """Call function(i) for i in range(count) and return the mean time in nanoseconds."""
+    start = time.perf_counter()
+    for i in range(count):
+        function(i)
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def append_fill(length: int) -> DynamicArray:
+    array = DynamicArray()
+    for _ in range(length):
+        array.append(None)
+    return array
+
+
+@contextlib.contextmanager
+def checked_access():
+    """Route the unchecked methods through the checked ones, as the maps did before."""
+    get_unchecked, set_unchecked = DynamicArray.get_unchecked, DynamicArray.set_unchecked
+    DynamicArray.get_unchecked, DynamicArray.set_unchecked = DynamicArray.get_at_index, DynamicArray.set_at_index
+    try:
+        yield
+    finally:
+        DynamicArray.get_unchecked, DynamicArray.set_unchecked = get_unchecked, set_unchecked
+
+
+def map_ops(module, keys: list, repeat: int = 3) -> tuple:
+    """Return the best mean put and get times in nanoseconds, over a few maps of the given keys."""
+    best_put = best_get = float('inf')
+    for _ in range(repeat):
+        m = module.HashMap(11, hash)
+        start = time.perf_counter()
+        for key in keys:
+            m.put(key, None)
+        best_put = min(best_put, (time.perf_counter() - start) / len(keys) * 1e9)
+        start = time.perf_counter()
+        for key in keys:
+            m.get(key)
+        best_get = min(best_get, (time.perf_counter() - start) / len(keys) * 1e9)
+    return best_put, best_get
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='DynamicArray checked and unchecked access')
+    parser.add_argument('--size', type=int, default=100000)
+    args = parser.parse_args()
+
+    array = DynamicArray.filled(args.size)
+    rows = (
+        ('get', per_op(array.get_at_index, args.size), per_op(array.get_unchecked, args.size)),
+        ('set', per_op(lambda i: array.set_at_index(i, i), args.size),
+         per_op(lambda i: array.set_unchecked(i, i), args.size)),
+        ('fill', per_op(lambda i: append_fill(args.size), 1) / args.size,
+         per_op(lambda i: DynamicArray.filled(args.size), 1) / args.size),
+    )
+    print(f"{'operation':>10} {'checked ns':>11} {'unchecked ns':>13} {'speedup':>8}")
+    for operation, checked, unchecked in rows:
+        print(f"{operation:>10} {checked:>11.1f} {unchecked:>13.1f} {checked / unchecked:>8.2f}")
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    print(f"\n{'map':>10} {'op':>4} {'checked ns':>11} {'unchecked ns':>13} {'speedup':>8}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        with checked_access():
+            checked_put, checked_get = map_ops(module, keys)
+        put, get = map_ops(module, keys)
+        print(f"{name:>10} {'put':>4} {checked_put:>11.1f} {put:>13.1f} {checked_put / put:>8.2f}")
+        print(f"{name:>10} {'get':>4} {checked_get:>11.1f} {get:>13.1f} {checked_get / get:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Description: Peak memory and time of writing out a hash map's contents, comparing the old way of
+# calling get_keys_and_values and then walking the DynamicArray of tuples it returns, against export
+# streaming the pairs into a sink. The sinks are a file (os.devnull, so no output is kept), a callable,
+# and a pair of array columns. The map is built before tracing starts, so tracemalloc only measures
+# the extra memory each way of writing it out needs; the array columns themselves are counted, since
+# they are the output.
+#
+# Run from the repository root:  python -m benchmarks.bench_export [--size 1000000]
+
+import argparse
+import array
+import gc
+import os
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_sc
+
+
+def via_keys_and_values(m, out) -> None:
+    pairs = m.get_keys_and_values()
+    for i in range(pairs.length()):
+        key, value = pairs.get_unchecked(i)
+        out.write(str(key) + '\t' + str(value) + '\n')
+
+
+def via_columns(m, out) -> None:
+    m.export((array.array('q'), array.array('q')))
+
+
+def measure(write, m, out) -> tuple:
+    """Return (peak MiB, seconds) for writing out the map once."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    write(m, out)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 2 ** 20, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Peak memory of get_keys_and_values against export')
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    print(f"{'map':>4} {'method':>20} {'peak MiB':>9} {'seconds':>8}")
+    with open(os.devnull, 'w') as out:
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            m = module.HashMap(11, hash, expected_size=args.size)
+            for i in range(args.size):
+                m.put(i, i)
+            for label, write in (('get_keys_and_values', via_keys_and_values),
+                                 ('export file', lambda m, out: m.export(out)),
+                                 ('export callable', lambda m, out: m.export(lambda key, value: None)),
+                                 ('export columns', via_columns)):
+                peak, elapsed = measure(write, m, out)
+                print(f"{name:>4} {label:>20} {peak:>9.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Description: Distribution quality benchmark for the hash functions in a6_include. For every hash
+# function and key set, the benchmark fills a separate chaining HashMap at a load factor of about 1
+# and reports its chain lengths, then fills an open addressing HashMap at a load factor below 0.5
+# and reports the number of probes a successful lookup takes. The time per hash call is also shown.
+#
+# Run from the repository root:  python -m benchmarks.bench_hash_quality [--size 20000]
+
+import argparse
+import itertools
+import random
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import (SeededHashFunction, hash_function_1, hash_function_2,
+                        hash_function_blake2b, hash_function_builtin)
+
+HASH_FUNCTIONS = (
+    ('hash_function_1', hash_function_1),
+    ('hash_function_2', hash_function_2),
+    ('builtin', hash_function_builtin),
+    ('blake2b', hash_function_blake2b),
+    ('seeded(42)', SeededHashFunction(42)),
+)
+
+
+def key_sets(size: int) -> dict:
+    """Return realistic key sets of the given size, keyed by name."""
+    rng = random.Random(size)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    return {
+        'sequential': ['key' + str(i) for i in range(size)],
+        'words': list({''.join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                       for _ in range(size)}),
+        'anagrams': [''.join(p) for p in itertools.islice(itertools.permutations('abcdefghij'), size)],
+        'paths': [f"/api/v1/users/{i // 10}/orders/{i % 10}" for i in range(size)],
+        'numeric': [str(i * 7919) for i in range(size)],
+    }
+
+
+def chain_stats(keys: list, function) -> tuple:
+    """Fill an SC map and return (empty bucket fraction, mean chain length, max chain length)."""
+    m = hash_map_sc.HashMap(len(keys), function)
+    for key in keys:
+        m.put(key, None)
+    stats = m.stats()
+    return stats['empty_buckets'] / stats['capacity'], stats['mean_chain_length'], stats['max_chain_length']
+
+
+def probe_stats(keys: list, function) -> tuple:
+    """Fill an OA map and return (mean probes, max probes) for looking up every key."""
+    m = hash_map_oa.HashMap(2 * len(keys) + 1, function)
+    for key in keys:
+        m.put(key, None)
+    stats = m.stats()
+    return stats['mean_probe_length'], stats['max_probe_length']
+
+
+def hash_time(keys: list, function) -> float:
+    """Return the mean time of one hash call in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Hash function distribution quality')
+    parser.add_argument('--size', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'keys':>10} {'function':>16} {'empty':>7} {'mean chain':>11} {'max chain':>10} "
+          f"{'mean probes':>12} {'max probes':>11} {'us/hash':>8}")
+    for set_name, keys in key_sets(args.size).items():
+        for name, function in HASH_FUNCTIONS:
+            empty, mean_chain, max_chain = chain_stats(keys, function)
+            mean_probes, max_probes = probe_stats(keys, function)
+            print(f"{set_name:>10} {name:>16} {empty:>7.2f} {mean_chain:>11.2f} {max_chain:>10} "
+                  f"{mean_probes:>12.2f} {max_probes:>11} {hash_time(keys, function):>8.2f}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+# Description: Benchmark for the open addressing HashMap's lookups. The benchmark builds
+# tables of increasing size and times get, contains_key and remove on a fixed sample of keys.
+# Since the lookups follow the key's probe sequence, the time per lookup should stay flat
+# as the table grows. Pass --power-of-two to time the mask-indexed power of two mode instead.
+#
+# Run from the repository root:  python -m benchmarks.bench_oa_lookup [--sizes 1000 10000 ...] [--power-of-two]
+
+import argparse
+import random
+import time
+
+from hash_map_oa import HashMap
+
+
+def build_map(size: int, power_of_two: bool = False) -> HashMap:
+    """Build an open addressing HashMap containing `size` string keys."""
+    m = HashMap(11, hash, power_of_two=power_of_two)  # Python's hash keeps the keys well spread, so the timing reflects the probing
+    for i in range(size):
+        m.put('key' + str(i), i)
+    return m
+
+
+def time_lookups(m: HashMap, keys: list, method: str) -> float:
+    """Return the mean time in microseconds of calling `method` for every key."""
+    operation = getattr(m, method)
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Open addressing HashMap lookup benchmark')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000, 1000000])
+    parser.add_argument('--sample', type=int, default=10000)
+    parser.add_argument('--power-of-two', action='store_true', help='use power of two capacities with mask indexing')
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'capacity':>10} {'get hit':>10} {'get miss':>10} {'contains':>10} {'remove':>10}  (us/op)")
+    for size in args.sizes:
+        m = build_map(size, args.power_of_two)
+        rng = random.Random(size)
+        hits = ['key' + str(rng.randrange(size)) for _ in range(args.sample)]
+        misses = ['missing' + str(i) for i in range(args.sample)]
+        get_hit = time_lookups(m, hits, 'get')
+        get_miss = time_lookups(m, misses, 'get')
+        contains = time_lookups(m, hits, 'contains_key')
+        remove = time_lookups(m, hits, 'remove')
+        print(f"{size:>10} {m.get_capacity():>10} {get_hit:>10.2f} {get_miss:>10.2f} {contains:>10.2f} {remove:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
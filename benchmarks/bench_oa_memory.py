@@ -0,0 +1,47 @@
+# Description: Memory benchmark comparing the HashEntry based open addressing HashMap with the
+# compact parallel array HashMap. The keys and values are created before tracing starts, so
+# tracemalloc only measures the memory used by each map's own storage.
+#
+# Run from the repository root:  python -m benchmarks.bench_oa_memory [--size 1000000]
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_oa_compact
+
+
+def measure(map_class, keys: list, values: list) -> tuple:
+    """Build a map of the given pairs, and return (bytes in use, peak bytes, seconds)."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    m = map_class(11, hash)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert m.get_size() == len(keys)
+    return current, peak, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Memory used by the OA HashMap storage layouts')
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    values = list(range(args.size))
+
+    print(f"{'layout':>12} {'MiB':>10} {'peak MiB':>10} {'bytes/entry':>12} {'build s':>8}")
+    for label, map_class in (('HashEntry', hash_map_oa.HashMap), ('compact', hash_map_oa_compact.HashMap)):
+        current, peak, elapsed = measure(map_class, keys, values)
+        print(f"{label:>12} {current / 2 ** 20:>10.1f} {peak / 2 ** 20:>10.1f} "
+              f"{current / args.size:>12.1f} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
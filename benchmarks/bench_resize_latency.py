@@ -0,0 +1,72 @@
+# Description: Benchmark comparing put latency with and without incremental resizing. Every put is
+# timed on its own, and the benchmark prints the latency percentiles and a histogram of the
+# latencies (in power of two buckets of nanoseconds) for both hash maps in both modes.
+# The garbage collector is disabled while timing, since its pauses don't depend on resizing;
+# pass --gc to leave it enabled.
+#
+# Run from the repository root:  python -m benchmarks.bench_resize_latency [--size 200000]
+
+import argparse
+import gc
+import time
+
+import hash_map_oa
+import hash_map_sc
+
+
+def put_latencies(m, size: int) -> list:
+    """Put `size` keys into the map and return the latency of every put in nanoseconds."""
+    latencies = []
+    clock = time.perf_counter_ns
+    for i in range(size):
+        key = 'key' + str(i)
+        start = clock()
+        m.put(key, i)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def percentile(ordered: list, fraction: float) -> int:
+    """Return the value at the given fraction of a sorted list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def histogram(latencies: list) -> dict:
+    """Count the latencies in power of two buckets, keyed by the bucket's upper bound."""
+    counts = {}
+    for latency in latencies:
+        bound = 1 << max(latency, 1).bit_length()
+        counts[bound] = counts.get(bound, 0) + 1
+    return counts
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Put latency with full and incremental resizing')
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--gc', action='store_true', help='leave the garbage collector enabled')
+    args = parser.parse_args()
+
+    results = []
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for incremental in (False, True):
+            m = module.HashMap(11, hash, incremental_resize=incremental)
+            if not args.gc:
+                gc.disable()
+            latencies = put_latencies(m, args.size)
+            gc.enable()
+            results.append((f"{name} {'incremental' if incremental else 'full'}", latencies))
+
+    print(f"{'map':>16} {'p50':>8} {'p99':>8} {'p99.9':>8} {'max':>12}  (ns)")
+    for label, latencies in results:
+        ordered = sorted(latencies)
+        print(f"{label:>16} {percentile(ordered, 0.5):>8} {percentile(ordered, 0.99):>8} "
+              f"{percentile(ordered, 0.999):>8} {ordered[-1]:>12}")
+
+    for label, latencies in results:
+        print(f"\n{label} histogram (upper bound in ns: count)")
+        for bound, count in sorted(histogram(latencies).items()):
+            print(f"{bound:>12}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+# Description: Head to head benchmark of the quadratic probing HashMap and the Robin Hood HashMap.
+# Each map is created with the capacity that its load factor limit calls for, and built from the
+# same keys. The benchmark times the build, successful and missing lookups and removals, and reports
+# the memory each table uses and the mean and longest probe lengths of its keys. The Robin Hood map
+# is run at a few maximum load factors, since running fuller is what it is for. Linear probing needs
+# a well distributed hash, so the builtin hash is the default; the course hash functions give many
+# keys the same hash, which makes long runs for both maps.
+#
+# Run from the repository root:  python -m benchmarks.bench_rh [--size 200000] [--hash builtin]
+
+import argparse
+import random
+import time
+import tracemalloc
+
+import hash_map_oa
+import hash_map_rh
+from a6_include import hash_function_2, hash_function_builtin
+
+HASH_FUNCTIONS = {'builtin': hash_function_builtin, 'hash_function_2': hash_function_2}
+
+
+def timed_per_op(operation, keys: list) -> float:
+    """Call the operation for every key and return the mean time in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def run(label: str, make_map, keys: list, values: list, hits: list, misses: list) -> None:
+    tracemalloc.start()
+    start = time.perf_counter()
+    m = make_map()
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    build = time.perf_counter() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    stats = m.stats()
+    get_hit = timed_per_op(m.get, hits)
+    get_miss = timed_per_op(m.get, misses)
+    remove = timed_per_op(m.remove, hits)
+    print(f"{label:>12} {stats['capacity']:>9} {stats['table_load']:>6.2f} {memory / 2 ** 20:>7.1f} "
+          f"{stats['mean_probe_length']:>6.2f} {stats['max_probe_length']:>5} {build:>8.2f} "
+          f"{get_hit:>8.2f} {get_miss:>8.2f} {remove:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Quadratic probing against Robin Hood hashing')
+    parser.add_argument('--size', type=int, default=200000)
+    parser.add_argument('--sample', type=int, default=20000)
+    parser.add_argument('--hash', choices=sorted(HASH_FUNCTIONS), default='builtin')
+    args = parser.parse_args()
+
+    function = HASH_FUNCTIONS[args.hash]
+    keys = ['key' + str(i) for i in range(args.size)]
+    values = list(range(args.size))
+    rng = random.Random(args.size)
+    hits = rng.sample(keys, min(args.sample, args.size))
+    misses = ['missing' + str(i) for i in range(args.sample)]
+
+    print(f"{'map':>12} {'capacity':>9} {'load':>6} {'MiB':>7} {'mean':>6} {'max':>5} {'build s':>8} "
+          f"{'get hit':>8} {'get miss':>8} {'remove':>8}  (probes, us/op)")
+    run('quadratic', lambda: hash_map_oa.HashMap(11, function, expected_size=args.size),
+        keys, values, hits, misses)
+    for max_load in (0.5, 0.85, 0.9):
+        run(f"rh {max_load}", lambda: hash_map_rh.HashMap(int(args.size / max_load) + 1, function, max_load=max_load),
+            keys, values, hits, misses)
+
+
+if __name__ == "__main__":
+    main()
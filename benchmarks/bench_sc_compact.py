@@ -0,0 +1,66 @@
+# Description: Memory and throughput benchmark comparing the LinkedList based separate chaining
+# HashMap with the compact inline chain HashMap. The keys and values are created before tracing
+# starts, so tracemalloc only measures the memory used by each map's own storage. The benchmark
+# also times creating an empty table, building the map, and successful and missing lookups.
+#
+# Run from the repository root:  python -m benchmarks.bench_sc_compact [--size 1000000]
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+import hash_map_sc
+import hash_map_sc_compact
+
+
+def timed_per_op(operation, keys: list) -> float:
+    """Call the operation for every key and return the mean time in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        operation(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def measure(map_class, keys: list, values: list, hits: list, misses: list) -> tuple:
+    """Return (bytes in use, build seconds, create ms, get hit us, get miss us) for one layout."""
+    start = time.perf_counter()
+    map_class(len(keys), hash)
+    create = (time.perf_counter() - start) * 1e3
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    m = map_class(11, hash)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    build = time.perf_counter() - start
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert m.get_size() == len(keys)
+    return current, build, create, timed_per_op(m.get, hits), timed_per_op(m.get, misses)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Memory and speed of the SC HashMap bucket layouts')
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--sample', type=int, default=100000)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    values = list(range(args.size))
+    rng = random.Random(args.size)
+    hits = [rng.choice(keys) for _ in range(args.sample)]
+    misses = ['missing' + str(i) for i in range(args.sample)]
+
+    print(f"{'layout':>12} {'MiB':>8} {'bytes/entry':>12} {'create ms':>10} {'build s':>8} "
+          f"{'get hit':>8} {'get miss':>9}  (us/op)")
+    for label, map_class in (('LinkedList', hash_map_sc.HashMap), ('compact', hash_map_sc_compact.HashMap)):
+        current, build, create, get_hit, get_miss = measure(map_class, keys, values, hits, misses)
+        print(f"{label:>12} {current / 2 ** 20:>8.1f} {current / args.size:>12.1f} {create:>10.1f} "
+              f"{build:>8.2f} {get_hit:>8.2f} {get_miss:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
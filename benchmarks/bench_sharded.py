@@ -0,0 +1,55 @@
+# Description: Build and lookup benchmark for ShardedHashMap. The build table compares building a
+# single HashMap with from_pairs against ShardedHashMap.build with a growing number of worker
+# processes (one shard per process), so the build time can be compared with the number of cores.
+# The lookup table times get_many over every key, in this process and split between forked
+# worker processes. The times include starting the worker processes, sending the arrays of hashes,
+# positions and bucket indices between processes, and linking every pair into its shard in this
+# process, which is the part of the build that doesn't get faster with more cores, so a small map
+# is faster to build in a single process.
+#
+# Run from the repository root:  python -m benchmarks.bench_sharded [--size 10000000] [--processes 1 2 4 8]
+
+import argparse
+import os
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import hash_function_blake2b
+from hash_map_sharded import ShardedHashMap
+
+MAP_CLASSES = {'sc': hash_map_sc.HashMap, 'oa': hash_map_oa.HashMap}
+
+
+def timed(function) -> tuple:
+    """Call the function and return (its result, the seconds it took)."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Parallel build and get_many of ShardedHashMap')
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--map', choices=sorted(MAP_CLASSES), default='sc')
+    args = parser.parse_args()
+
+    map_class = MAP_CLASSES[args.map]
+    pairs = [('key' + str(i), i) for i in range(args.size)]
+    keys = [key for key, _ in pairs]
+    print(f"{os.cpu_count()} CPUs, {args.size} keys, {args.map} shards")
+
+    _, single = timed(lambda: map_class.from_pairs(pairs, len(pairs), hash_function_blake2b))
+    print(f"{'processes':>10} {'build s':>8} {'speedup':>8} {'get_many s':>11}")
+    print(f"{'single map':>10} {single:>8.2f} {1:>8.2f}")
+    for processes in args.processes:
+        m, build = timed(lambda: ShardedHashMap.build(pairs, processes=processes, map_class=map_class))
+        assert m.get_size() == args.size
+        values, lookup = timed(lambda: m.get_many(keys, processes=processes))
+        assert values.length() == args.size
+        print(f"{processes:>10} {build:>8.2f} {single / build:>8.2f} {lookup:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
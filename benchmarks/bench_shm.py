@@ -0,0 +1,99 @@
+# Description: Per-worker startup time and memory of a read-mostly lookup table shared by a pool of
+# worker processes. In the "rebuild" case every worker builds its own open addressing HashMap from
+# the key/value pairs, which is what each worker had to do before. In the "shared" case the parent
+# builds one SharedHashMap and every worker attaches to it by name. Each worker reports the seconds
+# until its table was ready, the Python memory it allocated for the table (tracemalloc, which does not
+# count the shared block, since no process owns it), and its mean get time over a sample of keys.
+# The workers are started with spawn, so none of them inherits the parent's memory.
+#
+# Run from the repository root:  python -m benchmarks.bench_shm [--size 1000000] [--workers 4]
+
+import argparse
+import multiprocessing
+import random
+import time
+import tracemalloc
+
+import hash_map_oa
+from a6_include import hash_function_blake2b
+from hash_map_shm import SharedHashMap
+
+
+def make_pairs(size: int) -> list:
+    return [('key' + str(i), i) for i in range(size)]
+
+
+def rebuild_worker(job: tuple) -> tuple:
+    size, sample = job
+    pairs = make_pairs(size) # the source data every worker has to read in either way, so it isn't counted
+    start = time.perf_counter()
+    m = hash_map_oa.HashMap.from_pairs(pairs, size, hash_function_blake2b)
+    ready = time.perf_counter() - start
+    gets = timed_gets(m, sample)
+    del m
+    tracemalloc.start() # build it again to measure its memory, since tracing slows the build down
+    m = hash_map_oa.HashMap.from_pairs(pairs, size, hash_function_blake2b)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return ready, memory, gets
+
+
+def shared_worker(job: tuple) -> tuple:
+    name, sample = job
+    start = time.perf_counter()
+    m = SharedHashMap.attach(name)
+    ready = time.perf_counter() - start
+    gets = timed_gets(m, sample)
+    m.close()
+    tracemalloc.start()
+    m = SharedHashMap.attach(name)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    m.close()
+    return ready, memory, gets
+
+
+def timed_gets(m, keys: list) -> float:
+    """Return the mean time of getting each key in microseconds."""
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def report(label: str, results: list) -> None:
+    ready = sum(result[0] for result in results) / len(results)
+    memory = sum(result[1] for result in results) / len(results)
+    gets = sum(result[2] for result in results) / len(results)
+    print(f"{label:>8} {len(results):>8} {ready * 1e3:>9.1f} {memory / 2 ** 10:>10.1f} "
+          f"{memory / 2 ** 10 * len(results):>10.1f} {gets:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Per-worker cost of rebuilding a table against sharing one')
+    parser.add_argument('--size', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--sample', type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(args.size)
+    sample = ['key' + str(rng.randrange(args.size)) for _ in range(args.sample)]
+    context = multiprocessing.get_context('spawn')
+
+    start = time.perf_counter()
+    shared = SharedHashMap.build(make_pairs(args.size))
+    build = time.perf_counter() - start
+    print(f"SharedHashMap.build of {args.size} keys: {build:.2f} s, one shared block of "
+          f"{shared._shm.size / 2 ** 20:.1f} MiB")
+
+    print(f"{'table':>8} {'workers':>8} {'ready ms':>9} {'KiB/each':>10} {'KiB total':>10} {'get us':>8}")
+    try:
+        with context.Pool(args.workers) as pool:
+            report('rebuild', pool.map(rebuild_worker, [(args.size, sample)] * args.workers))
+            report('shared', pool.map(shared_worker, [(shared.get_name(), sample)] * args.workers))
+    finally:
+        shared.unlink()
+
+
+if __name__ == "__main__":
+    main()
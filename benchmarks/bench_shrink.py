@@ -0,0 +1,54 @@
+# Description: Benchmark of the cost of walking a hash map after most of its keys have been removed.
+# Each map is filled, then 90% of its keys are removed, and the benchmark times get_keys_and_values
+# (and iteration, for the open addressing HashMap) with shrinking off and with a low-water load
+# factor set. Without shrinking, the walk still scans the table at its peak capacity.
+#
+# Run from the repository root:  python -m benchmarks.bench_shrink [--size 200000]
+
+import argparse
+import time
+
+import hash_map_oa
+import hash_map_sc
+
+# the low-water load factor used for each map when shrinking is on
+SHRINK_LOADS = {'SC': 0.25, 'OA': 0.1}
+
+
+def timed(function) -> float:
+    """Call the function and return the milliseconds it took."""
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1e3
+
+
+def iterate(m) -> None:
+    for _ in m:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Walking a hash map after a 90% removal')
+    parser.add_argument('--size', type=int, default=200000)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    removed = keys[:args.size * 9 // 10]
+
+    print(f"{'map':>4} {'shrink':>7} {'capacity':>9} {'remove s':>9} {'keys/values ms':>15} {'iterate ms':>11}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        for shrink_load in (None, SHRINK_LOADS[name]):
+            m = module.HashMap(11, hash, shrink_load=shrink_load)
+            for key in keys:
+                m.put(key, None)
+            start = time.perf_counter()
+            for key in removed:
+                m.remove(key)
+            remove_time = time.perf_counter() - start
+            walk = timed(m.get_keys_and_values)
+            iteration = f"{timed(lambda: iterate(m)):>11.2f}" if hasattr(m, '__iter__') else f"{'-':>11}"
+            print(f"{name:>4} {str(shrink_load):>7} {m.get_capacity():>9} {remove_time:>9.3f} {walk:>15.2f} {iteration}")
+
+
+if __name__ == "__main__":
+    main()
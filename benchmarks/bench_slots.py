@@ -0,0 +1,74 @@
+# Description: Memory benchmark for the __slots__ based classes in a6_include. For the "before"
+# numbers, dict based copies of DynamicArray, SLNode, LinkedList, LinkedListIterator and HashEntry
+# (the same methods, without __slots__) are patched into a6_include and both hash map modules. The
+# benchmark then builds each map from the same keys under tracemalloc and reports bytes per entry.
+# The keys and values are created before tracing starts, so only the maps' own storage is measured.
+#
+# Run from the repository root:  python -m benchmarks.bench_slots [--size 1000000]
+
+import argparse
+import contextlib
+import gc
+import tracemalloc
+
+import a6_include
+import hash_map_oa
+import hash_map_sc
+
+SLOTTED_CLASSES = ('DynamicArray', 'SLNode', 'LinkedListIterator', 'LinkedList', 'HashEntry')
+
+
+def dict_based(cls: type) -> type:
+    """Return a copy of a slotted class that keeps its attributes in a per-instance __dict__."""
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name != '__slots__' and name not in cls.__slots__}
+    return type(cls.__name__, (), namespace)
+
+
+@contextlib.contextmanager
+def without_slots():
+    """Patch dict based copies of the slotted classes into every module that uses them."""
+    modules = (a6_include, hash_map_sc, hash_map_oa)
+    saved = [(module, name, getattr(module, name)) for module in modules
+             for name in SLOTTED_CLASSES if hasattr(module, name)]
+    copies = {name: dict_based(getattr(a6_include, name)) for name in SLOTTED_CLASSES}
+    for module, name, _ in saved:
+        setattr(module, name, copies[name])
+    try:
+        yield
+    finally:
+        for module, name, cls in saved:
+            setattr(module, name, cls)
+
+
+def measure(module, keys: list, values: list) -> int:
+    """Build a map of the given pairs and return the bytes its storage uses."""
+    gc.collect()
+    tracemalloc.start()
+    m = module.HashMap(11, hash)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert m.get_size() == len(keys)
+    return current
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Bytes per entry with and without __slots__')
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    values = list(range(args.size))
+
+    print(f"{'map':>4} {'before B/entry':>15} {'after B/entry':>14} {'saved':>7}")
+    for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+        with without_slots():
+            before = measure(module, keys, values)
+        after = measure(module, keys, values)
+        print(f"{name:>4} {before / args.size:>15.1f} {after / args.size:>14.1f} {1 - after / before:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# Description: Restart benchmark comparing rebuilding a hash map by replaying put for every
+# key/value pair against HashMap.load of a snapshot saved with HashMap.save. Replaying put hashes
+# every key, probes for its bucket and grows the table as it goes, while load puts every pair
+# straight back into its saved bucket. The snapshot's file size and the time to save it are also
+# reported, along with a load with a different hash function, which has to hash every key again.
+#
+# Run from the repository root:  python -m benchmarks.bench_snapshot [--size 1000000]
+
+import argparse
+import os
+import tempfile
+import time
+
+import hash_map_oa
+import hash_map_sc
+from a6_include import SeededHashFunction, hash_function_blake2b
+
+
+def timed(function) -> tuple:
+    """Call the function and return (its result, the seconds it took)."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def replay(module, keys: list, values: list):
+    m = module.HashMap(11, hash_function_blake2b)
+    for key, value in zip(keys, values):
+        m.put(key, value)
+    return m
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Loading a snapshot against replaying put')
+    parser.add_argument('--size', type=int, default=1000000)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    values = list(range(args.size))
+    path = os.path.join(tempfile.gettempdir(), 'bench_snapshot.snapshot')
+
+    print(f"{'map':>4} {'replay s':>9} {'save s':>7} {'MiB':>6} {'load s':>7} {'speedup':>8} {'rehash load s':>14}")
+    try:
+        for name, module in (('SC', hash_map_sc), ('OA', hash_map_oa)):
+            m, replayed = timed(lambda: replay(module, keys, values))
+            _, saved = timed(lambda: m.save(path))
+            loaded_map, loaded = timed(lambda: module.HashMap.load(path, hash_function_blake2b))
+            assert loaded_map.get_size() == args.size and loaded_map.get(keys[-1]) == values[-1]
+            _, rehashed = timed(lambda: module.HashMap.load(path, SeededHashFunction(1)))
+            print(f"{name:>4} {replayed:>9.2f} {saved:>7.2f} {os.path.getsize(path) / 2 ** 20:>6.1f} "
+                  f"{loaded:>7.2f} {replayed / loaded:>8.2f} {rehashed:>14.2f}")
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Description: Throughput benchmark for DurableHashMap at each durability level. Each run puts the
+# same keys into a fresh DurableHashMap in a temporary directory and reports the puts per second,
+# against a plain separate chaining HashMap with no log. Every level writes each record to the
+# operating system as it is made; 'none' never syncs the log, 'batch' syncs it after every batch of
+# records (group commit), and 'always' syncs it after every record, so its numbers depend on how fast the disk syncs. Each run then times reopening the
+# directory, which loads the snapshot and replays the log. Compaction is turned off, so the whole
+# log is replayed; the last row compacts first, so reopening only has to load the snapshot.
+#
+# Run from the repository root:  python -m benchmarks.bench_wal [--size 100000] [--batch-size 64]
+
+import argparse
+import shutil
+import tempfile
+import time
+
+import hash_map_sc
+from a6_include import hash_function_blake2b
+from hash_map_wal import DURABILITY_LEVELS, DurableHashMap
+
+
+def timed(function) -> tuple:
+    """Call the function and return (its result, the seconds it took)."""
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def fill(m, keys: list) -> None:
+    for i, key in enumerate(keys):
+        m.put(key, i)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='DurableHashMap throughput by durability level')
+    parser.add_argument('--size', type=int, default=100000)
+    parser.add_argument('--always-size', type=int, default=2000, help='puts for the per-record sync level')
+    parser.add_argument('--batch-size', type=int, default=64)
+    args = parser.parse_args()
+
+    keys = ['key' + str(i) for i in range(args.size)]
+    _, plain = timed(lambda: fill(hash_map_sc.HashMap(11, hash_function_blake2b), keys))
+    print(f"{'durability':>12} {'puts':>8} {'puts/s':>10} {'vs no log':>10} {'reopen s':>9}")
+    print(f"{'no log':>12} {args.size:>8} {args.size / plain:>10,.0f} {1:>10.2f}")
+
+    for durability in DURABILITY_LEVELS + ('compacted',):
+        size = args.always_size if durability == 'always' else args.size
+        directory = tempfile.mkdtemp()
+        try:
+            m = DurableHashMap(directory, hash_function_blake2b, durability='none' if durability == 'compacted' else durability,
+                               batch_size=args.batch_size, compact_after=float('inf'))
+            _, elapsed = timed(lambda: fill(m, keys[:size]))
+            if durability == 'compacted':
+                m.compact()
+            m.close()
+            reopened, reopen = timed(lambda: DurableHashMap(directory, hash_function_blake2b))
+            assert reopened.get_size() == size
+            reopened.close()
+        finally:
+            shutil.rmtree(directory)
+        per_second = size / elapsed
+        print(f"{durability:>12} {size:>8} {per_second:>10,.0f} {per_second / (args.size / plain):>10.2f} {reopen:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
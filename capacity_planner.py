@@ -0,0 +1,83 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Choosing the capacities of the HashMap classes
+# Description: This module chooses the capacities of the hash tables. Both HashMap classes use it to
+# find prime capacities, with a deterministic Miller-Rabin test in place of trial division, so a
+# resize costs a few modular exponentiations per candidate instead of up to sqrt(capacity) divisions.
+# The module also holds the power of two capacities used by the open addressing HashMap's
+# mask-indexed mode.
+
+# with these bases the Miller-Rabin test gives the exact answer for every integer below 3.3 * 10**24
+_WITNESSES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37)
+
+# smaller integers need fewer bases: (bound, bases) pairs where the bases are exact below the bound
+_SHORT_WITNESSES = (
+    (3215031751, (2, 3, 5, 7)),
+    (3474749660383, (2, 3, 5, 7, 11, 13)),
+)
+
+
+def is_prime(capacity: int) -> bool:
+    """
+    This function takes an integer as its parameter. The function returns True if the integer is
+    a prime number, and False if otherwise. Small factors are ruled out by division first, and the
+    rest is decided by a Miller-Rabin test with fixed bases, which has no false positives for any
+    capacity a hash table could have.
+    """
+    if capacity < 2:
+        return False
+    for witness in _WITNESSES: # division by the small primes settles most integers straight away
+        if capacity % witness == 0:
+            return capacity == witness
+    if capacity < 41 * 41: # the integer has no prime factor up to its square root
+        return True
+
+    witnesses = _WITNESSES
+    for bound, short_witnesses in _SHORT_WITNESSES:
+        if capacity < bound:
+            witnesses = short_witnesses
+            break
+
+    d = capacity - 1 # write capacity - 1 as d * 2**s, with d odd
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for witness in witnesses:
+        x = pow(witness, d, capacity)
+        if x == 1 or x == capacity - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % capacity
+            if x == capacity - 1:
+                break
+        else: # the witness proves that the capacity is composite
+            return False
+    return True
+
+
+def next_prime(capacity: int) -> int:
+    """
+    This function takes an integer as its parameter. The function returns the closest odd prime
+    number that is greater than or equal to the integer. An even integer is first rounded up to
+    the next odd one, so next_prime(2) is 3, just like the HashMap classes have always done.
+    """
+    if capacity % 2 == 0:
+        capacity += 1
+
+    while not is_prime(capacity):
+        capacity += 2
+
+    return capacity
+
+
+def next_power_of_two(capacity: int) -> int:
+    """
+    This function takes an integer as its parameter. The function returns the smallest
+    power of two that is greater than or equal to the integer, and at least 2.
+    """
+    if capacity <= 2:
+        return 2
+    return 1 << (capacity - 1).bit_length()
@@ -0,0 +1,303 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using separate chaining
+# Description: This program implements a thread-safe HashMap class using separate chaining for
+# collision resolution, built from the same DynamicArray of LinkedLists as the HashMap in
+# hash_map_sc.py. Instead of one lock for the whole map, the buckets are split between a fixed
+# number of stripes, each with its own lock, so threads that put or remove keys in different
+# stripes don't wait for each other. Reads take no lock at all. The buckets and capacity are
+# published together as a single tuple, so a reader always sees a bucket array and the capacity
+# it was built for, and resizing builds a new bucket array out of copied nodes while holding every
+# stripe lock, so a reader still walking the old buckets is never disturbed.
+
+import threading
+
+from a6_include import (DynamicArray, LinkedList,
+                        hash_function_1, hash_function_2)
+from capacity_planner import next_prime
+
+
+class ConcurrentHashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, stripes: int = 16) -> None:
+        """
+        Initialize new thread-safe HashMap that uses
+        separate chaining for collision resolution.
+        The buckets are guarded by the given number
+        of stripe locks, bucket i by lock i % stripes.
+        """
+        if stripes < 1:
+            raise ValueError('a ConcurrentHashMap needs at least 1 stripe')
+        capacity = next_prime(capacity) # capacity must be a prime number
+        buckets = DynamicArray([LinkedList() for _ in range(capacity)])
+        self._table = (buckets, capacity) # replaced as a whole, so readers never see a mismatched pair
+
+        self._hash_function = function
+        self._stripes = stripes
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes # number of key/value pairs in each stripe, only changed under its lock
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        buckets, capacity = self._table
+        out = ''
+        for i in range(capacity):
+            out += str(i) + ': ' + str(buckets.get_unchecked(i)) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(self._counts)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    # ------------------------------------------------------------------ #
+
+    def _lock_bucket(self, hash: int) -> tuple:
+        """
+        This method takes a key's hash as its parameter. The method acquires the
+        stripe lock of the key's bucket, and returns the bucket's linked list, the
+        stripe and the capacity the bucket belongs to. If the table is resized while
+        the method waits for the lock, then it tries again in the new table, so the
+        linked list it returns is always in the current table.
+        """
+        while True:
+            buckets, capacity = self._table
+            index = hash % capacity
+            stripe = index % self._stripes
+            lock = self._locks[stripe]
+            lock.acquire()
+            if self._table[0] is buckets: # the table can't be replaced while the stripe lock is held
+                return buckets.get_unchecked(index), stripe, capacity
+            lock.release()
+
+    def _lock_all(self) -> None:
+        """
+        This method takes no parameters. The method acquires every stripe lock, always
+        in the same order, so that two threads locking the whole map can't deadlock.
+        """
+        for lock in self._locks:
+            lock.acquire()
+
+    def _unlock_all(self) -> None:
+        """
+        This method takes no parameters. The method releases every stripe lock.
+        """
+        for lock in reversed(self._locks):
+            lock.release()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates
+        the key/value pair in the hash map. If the given key is not in the hash map, then
+        the given key/value pair is added. If the given key already exists in the hash map,
+        then its value is replaced with the given value. Only the stripe lock of the key's
+        bucket is held. If the load factor of the table reaches 1, then the capacity is doubled.
+        """
+        hash = self._hash_function(key)
+        linked_list, stripe, capacity = self._lock_bucket(hash)
+        try:
+            node = linked_list.contains(key, hash)
+            if node is not None: # the key is already in the hash map, so replace its value
+                node.value = value
+                return
+            linked_list.insert(key, value, hash) # the new node is linked in before it becomes the head, so readers never see it half built
+            self._counts[stripe] += 1
+            grow = sum(self._counts) >= capacity # the other stripes' counts may be a moment old, which is close enough
+        finally:
+            self._locks[stripe].release()
+
+        if grow: # the stripe lock has to be released first, since resizing takes every stripe lock
+            self._resize(capacity, next_prime(capacity * 2))
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method changes the hash table's
+        underlying capacity. If the given new capacity is less than 1, then the method does
+        nothing. Otherwise the capacity is made a prime number, and doubled for as long as
+        the load factor would still be above 1.
+        """
+        if new_capacity < 1: # if the given capacity is less than 1, then don't do anything
+            return
+        new_capacity = next_prime(new_capacity)
+        while self.get_size() > new_capacity:
+            new_capacity = next_prime(new_capacity * 2)
+        self._resize(None, new_capacity)
+
+    def _resize(self, expected_capacity: int, new_capacity: int) -> None:
+        """
+        This method takes the capacity the caller saw, and a new capacity, as its parameters.
+        The method holds every stripe lock while it copies the nodes into a new bucket array,
+        and then publishes the new buckets and capacity together. If the capacity is no longer
+        the one the caller saw, then another thread has already resized the table and the
+        method does nothing, so several threads growing the same full table only resize it
+        once. An expected capacity of None always resizes.
+        """
+        self._lock_all()
+        try:
+            old_buckets, old_capacity = self._table
+            if expected_capacity is not None and old_capacity != expected_capacity:
+                return
+
+            buckets = DynamicArray([LinkedList() for _ in range(new_capacity)])
+            counts = [0] * self._stripes
+            index = 0
+            while index < old_capacity:
+                for node in old_buckets.get_unchecked(index):
+                    # the old nodes are copied rather than relinked, since readers may still be walking them
+                    new_index = node.hash % new_capacity
+                    buckets.get_unchecked(new_index).insert(node.key, node.value, node.hash)
+                    counts[new_index % self._stripes] += 1
+                index += 1
+
+            self._counts = counts
+            self._table = (buckets, new_capacity) # publish the new table in a single step
+        finally:
+            self._unlock_all()
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor. The load factor is the hash table's current size divided by its
+        current capacity.
+        """
+        return self.get_size() / self._table[1]
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number of empty buckets
+        that are currently in the hash table. No lock is taken, so while other threads are
+        writing the count is only a snapshot.
+        """
+        buckets, capacity = self._table
+        empty = 0
+        for index in range(capacity):
+            if buckets.get_unchecked(index).length() == 0:
+                empty += 1
+        return empty
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None. No lock is taken.
+        """
+        hash = self._hash_function(key)
+        buckets, capacity = self._table # read the buckets and capacity together
+        node = buckets.get_unchecked(hash % capacity).contains(key, hash)
+        if node is None:
+            return None
+        return node.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise. No lock is taken.
+        """
+        hash = self._hash_function(key)
+        buckets, capacity = self._table
+        return buckets.get_unchecked(hash % capacity).contains(key, hash) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value from the hash map. If the
+        given key does not exist in the hash map, then the method does nothing. Only the
+        stripe lock of the key's bucket is held.
+        """
+        hash = self._hash_function(key)
+        linked_list, stripe, _ = self._lock_bucket(hash)
+        try:
+            if linked_list.remove(key, hash): # unlinking a node leaves its own next link alone, so a reader standing on it can carry on
+                self._counts[stripe] -= 1
+        finally:
+            self._locks[stripe].release()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map. Every stripe lock is held while the tuples are collected,
+        so they are a consistent snapshot of the hash map.
+        """
+        self._lock_all()
+        try:
+            buckets, capacity = self._table
+            pairs = []
+            for index in range(capacity):
+                for node in buckets.get_unchecked(index):
+                    pairs.append((node.key, node.value))
+        finally:
+            self._unlock_all()
+        return DynamicArray(pairs)
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears the content that is
+        currently in the hash map. The method does not change the hash table's
+        underlying capacity.
+        """
+        self._lock_all()
+        try:
+            capacity = self._table[1]
+            self._counts = [0] * self._stripes
+            self._table = (DynamicArray([LinkedList() for _ in range(capacity)]), capacity)
+        finally:
+            self._unlock_all()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example 1")
+    print("-------------")
+    m = ConcurrentHashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nremove and get_keys_and_values example 1")
+    print("----------------------------------------")
+    m = ConcurrentHashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.remove('1')
+    m.put('2', '200')
+    print(m.get_keys_and_values())
+    m.resize_table(2)
+    print(m.get_keys_and_values(), m.get_capacity(), m.get('3'), m.contains_key('1'))
+    try:
+        ConcurrentHashMap(11, hash_function_2, stripes=0)
+    except ValueError as error:
+        print(error)
+
+    print("\nthreads example 1")
+    print("-----------------")
+    m = ConcurrentHashMap(11, hash_function_1)
+
+    def writer(thread: int) -> None:
+        for i in range(2000):
+            m.put('key' + str(thread) + '_' + str(i), i)
+        for i in range(0, 2000, 2):
+            m.remove('key' + str(thread) + '_' + str(i))
+
+    threads = [threading.Thread(target=writer, args=(t,)) for t in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    result = True
+    for t in range(8):
+        for i in range(2000):
+            result &= m.get('key' + str(t) + '_' + str(i)) == (i if i % 2 else None)
+    print(m.get_size(), result, m.get_size() == m.get_keys_and_values().length())
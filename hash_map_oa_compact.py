@@ -0,0 +1,333 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using open addressing
+# Description: This program implements a HashMap class using open addressing with quadratic
+# probing for collision resolution, with the same public methods as the HashMap in hash_map_oa.py.
+# Instead of a DynamicArray of HashEntry objects, the buckets are stored as parallel flat arrays:
+# a list of keys, a list of values, an array of the keys' cached hashes, and a bytearray holding
+# the state of each bucket (empty, active or tombstone). No object is created per key/value pair,
+# and replacing a key's value allocates nothing, which cuts the memory used per entry by about
+# 2.2 times (116 to 52.5 bytes per entry in benchmarks/bench_oa_memory.py).
+
+from array import array
+
+from a6_include import (DynamicArray, HashEntry, hash_function_1, hash_function_2)
+from capacity_planner import is_prime, next_prime
+
+# the states of a bucket, stored in the _states bytearray
+EMPTY = 0
+ACTIVE = 1
+TOMBSTONE = 2
+
+# the cached hashes are kept non-negative and within 63 bits, so they fit in a signed 64-bit array
+_HASH_MASK = (1 << 63) - 1
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, tombstone_limit: float = 0.25) -> None:
+        """
+        Initialize new HashMap that uses
+        quadratic probing for collision resolution,
+        storing its buckets in parallel flat arrays.
+        Once the tombstones make up more than tombstone_limit of the
+        capacity, the table is rehashed in place to clear them out.
+        """
+        self._capacity = self._next_prime(capacity) # capacity must be a prime number
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('q', bytes(8 * self._capacity))
+        self._states = bytearray(self._capacity)
+
+        self._hash_function = function
+        self._size = 0
+        self._tombstones = 0 # number of buckets in the TOMBSTONE state
+        self._tombstone_limit = tombstone_limit
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += (str(i) + ': K: ' + str(self._keys[i]) + ' V: ' + str(self._values[i]) +
+                        ' TS: ' + str(self._states[i] == TOMBSTONE) + '\n')
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        """
+        return next_prime(capacity)
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        """
+        return is_prime(capacity)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates
+        the key/value pair in the hash map. If the given key is not in the hash map, then
+        the given key/value pair is added to the hash map. If the given key already exists
+        in the hash map, then its value is replaced with the given value. If the load factor
+        of the table is greater than or equal to 0.5, then the table's capacity is doubled.
+        A new key/value pair reuses the first tombstone on its probe sequence, once the rest
+        of the sequence shows the key isn't already in the hash map.
+        """
+
+        if self._size / self._capacity >= 0.5: # if the load factor is greater than 0.5, then double the capacity of the hash table.
+            self.resize_table(self._capacity * 2)
+
+        hash = self._hash_function(key) & _HASH_MASK
+        capacity = self._capacity
+        states, keys, hashes = self._states, self._keys, self._hashes
+        i_initial = hash % capacity # get the initial index of the given key/value pair
+        j = 0
+        quad_probe = i_initial
+        first_tombstone = -1 # the index of the first tombstone on the probe sequence, which the new pair can reuse
+
+        state = states[quad_probe]
+        while state != EMPTY and j < capacity:
+            if state == TOMBSTONE: # remember the first tombstone, but keep probing, since the key could still be further along the probe sequence
+                if first_tombstone == -1:
+                    first_tombstone = quad_probe
+            elif hashes[quad_probe] == hash and keys[quad_probe] == key: # the key is already in the hash map, so replace its value
+                self._values[quad_probe] = value
+                return
+            j += 1
+            quad_probe = (i_initial + j * j) % capacity
+            state = states[quad_probe]
+
+        if first_tombstone != -1: # the key isn't in the hash map, so add the given key/value pair into the first tombstone's bucket
+            quad_probe = first_tombstone
+            self._tombstones -= 1
+        elif state != EMPTY: # the probe sequence found neither an empty bucket nor a tombstone, so clean up the table and try again
+            self._rehash(self._capacity)
+            self.put(key, value)
+            return
+
+        states[quad_probe] = ACTIVE
+        keys[quad_probe] = key
+        self._values[quad_probe] = value
+        hashes[quad_probe] = hash
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method changes the hash table's
+        underlying capacity, moving all the active key/value pairs into the new table using their
+        cached hashes. If the given new capacity is less than the current number of elements in
+        the hash map, then the method does nothing. Otherwise the capacity is made a prime number,
+        and doubled for as long as the load factor would still be 0.5 or more.
+        """
+
+        if self._size > new_capacity:  # if the given capacity is less than the current size, then don't do anything
+            return
+
+        new_capacity = self._next_prime(new_capacity) # this ensures new_capacity is a prime number
+        while (self._size - 1) / new_capacity >= 0.5: # the table still has to hold every pair with a load factor below 0.5
+            new_capacity = self._next_prime(new_capacity * 2)
+        self._rehash(new_capacity)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method moves every active
+        key/value pair into new arrays of the new capacity, placing each one straight into the
+        first empty bucket of its probe sequence. The cached hashes are reused, so no key is
+        hashed again. Tombstones are dropped.
+        """
+        old_keys, old_values, old_hashes, old_states = self._keys, self._values, self._hashes, self._states
+        keys = [None] * new_capacity
+        values = [None] * new_capacity
+        hashes = array('q', bytes(8 * new_capacity))
+        states = bytearray(new_capacity)
+
+        for index in range(self._capacity):
+            if old_states[index] == ACTIVE:
+                hash = old_hashes[index]
+                i_initial = hash % new_capacity
+                j = 0
+                quad_probe = i_initial
+                while states[quad_probe] != EMPTY: # the new arrays contain no tombstones or duplicates, so just find the first empty bucket
+                    j += 1
+                    quad_probe = (i_initial + j * j) % new_capacity
+                states[quad_probe] = ACTIVE
+                keys[quad_probe] = old_keys[index]
+                values[quad_probe] = old_values[index]
+                hashes[quad_probe] = hash
+
+        self._capacity = new_capacity
+        self._keys, self._values, self._hashes, self._states = keys, values, hashes, states
+        self._tombstones = 0
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor. The load factor is the hash table's current size divided by its
+        current capacity.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty buckets that are currently in the hash table.
+        """
+        return self._states.count(EMPTY)
+
+    def _find_index(self, key: str) -> int:
+        """
+        This method takes a key as its parameter. The method follows the key's quadratic probe
+        sequence and returns the index of the active bucket containing the given key, comparing
+        the cached hashes before the keys. The probe stops at the first empty bucket. If the key
+        is not in the hash map, then the method returns -1.
+        """
+        hash = self._hash_function(key) & _HASH_MASK
+        capacity = self._capacity
+        states, keys, hashes = self._states, self._keys, self._hashes
+        i_initial = hash % capacity
+        j = 0
+        quad_probe = i_initial
+        while j < capacity:
+            state = states[quad_probe]
+            if state == EMPTY: # an empty bucket ends the probe sequence, so the key isn't in the hash map
+                return -1
+            if state == ACTIVE and hashes[quad_probe] == hash and keys[quad_probe] == key:
+                return quad_probe
+            j += 1
+            quad_probe = (i_initial + j * j) % capacity
+        return -1
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None.
+        """
+        index = self._find_index(key)
+        if index == -1:
+            return None
+        return self._values[index]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        return self._find_index(key) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value, leaving a tombstone in
+        its bucket. If the given key does not exist in the hash map, then the method does nothing.
+        """
+        index = self._find_index(key)
+        if index == -1:
+            return
+        self._states[index] = TOMBSTONE
+        self._keys[index] = None # drop the references, so the key and value can be freed
+        self._values[index] = None
+        self._size -= 1
+        self._tombstones += 1
+
+        if self._tombstone_limit is not None and self._tombstones > self._tombstone_limit * self._capacity:
+            self._rehash(self._capacity) # too many tombstones make the probe sequences long, so clear them out
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map.
+        """
+        key_vals_arr = DynamicArray()
+        states, keys, values = self._states, self._keys, self._values
+        for index in range(len(states)):
+            if states[index] == ACTIVE:
+                key_vals_arr.append((keys[index], values[index]))
+        return key_vals_arr
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears the content that is
+        currently in the hash map. The method does not change the hash table's
+        underlying capacity.
+        """
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('q', bytes(8 * self._capacity))
+        self._states = bytearray(self._capacity)
+        self._size = 0
+        self._tombstones = 0
+
+    def __iter__(self):
+        """
+        This method takes no parameters. The method returns an iterator over the active
+        buckets of the hash map, as HashEntry objects, just like the HashMap in hash_map_oa.py.
+        The buckets don't hold HashEntry objects, so each one is built as it is reached, and
+        changing its value does not change the hash map.
+        """
+        states, keys, values, hashes = self._states, self._keys, self._values, self._hashes
+        return (HashEntry(keys[index], values[index], hashes[index])
+                for index in range(len(states)) if states[index] == ACTIVE)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example 1")
+    print("-------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\ncontains_key example 1")
+    print("----------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nremove and get_keys_and_values example 1")
+    print("----------------------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.remove('1')
+    m.put('2', '200')
+    print(m.get_keys_and_values())
+    m.resize_table(2)
+    print(m.get_keys_and_values(), m.get_capacity())
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
@@ -0,0 +1,348 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using Robin Hood hashing
+# Description: This program implements a HashMap class using open addressing with Robin Hood
+# hashing for collision resolution, with the same public methods as the HashMap in hash_map_oa.py.
+# Keys are placed by linear probing, but a key being inserted takes the bucket of any key that is
+# closer to its own initial bucket, so every probe sequence stays short and the probe lengths vary
+# little. A lookup can stop as soon as it passes a key closer to home than itself. Removal shifts
+# the following keys back one bucket instead of leaving a tombstone, so the table never fills up
+# with tombstones, and it can run at load factors of 0.8 to 0.9.
+
+import time
+
+from a6_include import (DynamicArray, HashEntry, hash_function_1, hash_function_2)
+from capacity_planner import next_prime
+
+# a key's initial bucket is its hash times this odd constant, modulo the capacity. Linear probing turns
+# runs of consecutive hashes, which the course hash functions produce, into long clusters, and the
+# multiplication spreads those hashes around the table without changing which keys collide
+_SPREAD = 2654435761
+
+
+class HashMap:
+    def __init__(self, capacity: int, function, max_load: float = 0.85) -> None:
+        """
+        Initialize new HashMap that uses
+        Robin Hood hashing for collision resolution.
+        The table is doubled before a put would take
+        the load factor above max_load, which must be
+        above 0 and below 1.
+        """
+        if not 0 < max_load < 1: # a full table has no empty bucket to end a probe sequence
+            raise ValueError('max_load must be above 0 and below 1')
+        self._capacity = next_prime(capacity) # capacity must be a prime number
+        self._buckets = DynamicArray.filled(self._capacity)
+        self._hash_function = function
+        self._size = 0
+        self._max_load = max_load
+        self._resize_count = 0 # number of times the table has been rebuilt
+        self._resize_time = 0.0 # total seconds spent rebuilding the table
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates
+        the key/value pair in the hash map. If the given key is not in the hash map, then
+        the given key/value pair is added to the hash map. If the given key already exists
+        in the hash map, then its value is replaced with the given value. If adding the pair
+        would take the load factor above max_load, then the table's capacity is doubled first.
+        """
+
+        if (self._size + 1) / self._capacity > self._max_load: # the new pair would take the load factor above max_load, so double the capacity
+            self.resize_table(self._capacity * 2)
+
+        hash = self._hash_function(key)
+        buckets = self._buckets
+        capacity = self._capacity
+        index = hash * _SPREAD % capacity
+        distance = 0 # how far the key being placed is from its initial bucket
+
+        entry = buckets.get_unchecked(index)
+        while entry is not None:
+            entry_distance = (index - entry.hash * _SPREAD) % capacity # how far the key in this bucket is from its initial bucket
+            if entry_distance < distance: # every key closer to home than ours has been passed, so the key isn't in the hash map
+                break
+            if entry.hash == hash and entry.key == key: # the key is already in the hash map, so replace its value
+                entry.value = value
+                return
+            distance += 1
+            index = (index + 1) % capacity
+            entry = buckets.get_unchecked(index)
+
+        self._place(HashEntry(key, value, hash), index, distance, buckets, capacity)
+        self._size += 1
+
+    @staticmethod
+    def _place(entry: HashEntry, index: int, distance: int, buckets: DynamicArray, capacity: int) -> None:
+        """
+        This method takes a hash entry, the index to start at, the entry's distance from its initial
+        bucket at that index, a bucket array and its capacity as its parameters. The method places
+        the entry, which must not already be in the buckets. Whenever the entry reaches a bucket
+        whose key is closer to its own initial bucket, the two swap places, and the displaced
+        entry carries on along the probe sequence until an empty bucket is found.
+        """
+        while True:
+            bucket = buckets.get_unchecked(index)
+            if bucket is None:
+                buckets.set_unchecked(index, entry)
+                return
+            bucket_distance = (index - bucket.hash * _SPREAD) % capacity
+            if bucket_distance < distance: # the entry further from home takes the bucket
+                buckets.set_unchecked(index, entry)
+                entry, distance = bucket, bucket_distance
+            distance += 1
+            index = (index + 1) % capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method changes the hash table's
+        underlying capacity, placing every key/value pair into the new table using their cached
+        hashes. If the given new capacity is less than the current number of elements in the hash
+        map, then the method does nothing. Otherwise the capacity is made a prime number, and
+        doubled for as long as the load factor would still be above max_load.
+        """
+
+        if self._size > new_capacity: # if the given capacity is less than the current size, then don't do anything
+            return
+
+        new_capacity = next_prime(new_capacity) # this ensures new_capacity is a prime number
+        while self._size / new_capacity > self._max_load: # the table still has to hold every pair within max_load, just like put would
+            new_capacity = next_prime(new_capacity * 2)
+
+        start = time.perf_counter()
+        buckets = self._buckets
+        new_buckets = DynamicArray.filled(new_capacity) # allocate all the new empty buckets at once
+        index = 0
+        while index < self._capacity:
+            entry = buckets.get_unchecked(index)
+            if entry is not None: # the entry keeps its key's hash, so the key doesn't need to be hashed again
+                self._place(entry, entry.hash * _SPREAD % new_capacity, 0, new_buckets, new_capacity)
+            index += 1
+        self._capacity, self._buckets = new_capacity, new_buckets
+
+        self._resize_time += time.perf_counter() - start
+        self._resize_count += 1
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor. The load factor is the hash table's current size divided by its
+        current capacity.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty buckets that are currently in the hash table.
+        """
+        return self._capacity - self._size # there are no tombstones, so every bucket without a pair is empty
+
+    def _find_index(self, key: str) -> int:
+        """
+        This method takes a key as its parameter. The method follows the key's probe sequence
+        and returns the index of the bucket containing the given key, comparing the cached hashes
+        before the keys. The probe stops at the first empty bucket, or as soon as it reaches a
+        key that is closer to its own initial bucket than the given key would be, since Robin
+        Hood placement would have put the given key there. If the key is not in the hash map,
+        then the method returns -1.
+        """
+        hash = self._hash_function(key)
+        buckets = self._buckets
+        capacity = self._capacity
+        index = hash * _SPREAD % capacity
+        distance = 0
+        entry = buckets.get_unchecked(index)
+        while entry is not None:
+            if entry.hash == hash and entry.key == key:
+                return index
+            if (index - entry.hash * _SPREAD) % capacity < distance: # an early miss
+                return -1
+            distance += 1
+            index = (index + 1) % capacity
+            entry = buckets.get_unchecked(index)
+        return -1
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None.
+        """
+        index = self._find_index(key)
+        if index == -1:
+            return None
+        return self._buckets.get_unchecked(index).value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        return self._find_index(key) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value. The keys that follow it
+        on the probe sequence are shifted back one bucket each, until an empty bucket or a
+        key that is already in its initial bucket is reached, so no tombstone is needed. If
+        the given key does not exist in the hash map, then the method does nothing.
+        """
+        index = self._find_index(key)
+        if index == -1:
+            return
+
+        buckets = self._buckets
+        capacity = self._capacity
+        next_index = (index + 1) % capacity
+        entry = buckets.get_unchecked(next_index)
+        while entry is not None and (next_index - entry.hash * _SPREAD) % capacity != 0: # the entry isn't in its initial bucket, so move it one closer
+            buckets.set_unchecked(index, entry)
+            index = next_index
+            next_index = (index + 1) % capacity
+            entry = buckets.get_unchecked(next_index)
+        buckets.set_unchecked(index, None)
+        self._size -= 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map.
+        """
+        key_vals_arr = DynamicArray()
+        for entry in self:
+            key_vals_arr.append((entry.key, entry.value))
+        return key_vals_arr
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears the content that is
+        currently in the hash map. The method does not change the hash table's
+        underlying capacity.
+        """
+        self._buckets = DynamicArray.filled(self._capacity)
+        self._size = 0
+
+    def stats(self) -> dict:
+        """
+        This method takes no parameters. The method returns a dictionary of statistics about
+        the hash table: its size, capacity, load factor, number of empty buckets, a histogram
+        of how many buckets each key's probe sequence looks at (probe length: number of keys),
+        the longest and mean probe length, how many times the table has been resized, and the
+        total seconds spent resizing.
+        """
+        histogram = {}
+        longest = 0
+        total = 0
+        index = 0
+        while index < self._capacity: # a key's probe length is one more than its distance from its initial bucket
+            entry = self._buckets.get_unchecked(index)
+            if entry is not None:
+                length = (index - entry.hash * _SPREAD) % self._capacity + 1
+                histogram[length] = histogram.get(length, 0) + 1
+                total += length
+                if length > longest:
+                    longest = length
+            index += 1
+
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self.empty_buckets(),
+            'probe_length_histogram': histogram,
+            'max_probe_length': longest,
+            'mean_probe_length': total / self._size if self._size else 0.0,
+            'resize_count': self._resize_count,
+            'resize_time': self._resize_time,
+        }
+
+    def __iter__(self):
+        """
+        This method takes no parameters. The method returns an iterator over
+        the hash entries of the hash map's non-empty buckets.
+        """
+        buckets = self._buckets
+        return (buckets.get_unchecked(index) for index in range(self._capacity)
+                if buckets.get_unchecked(index) is not None)
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example 1")
+    print("-------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\ncontains_key example 1")
+    print("----------------------")
+    m = HashMap(79, hash_function_2)
+    keys = [i for i in range(1, 1000, 20)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    result = True
+    for key in keys:
+        # all inserted keys must be present
+        result &= m.contains_key(str(key))
+        # NOT inserted keys must be absent
+        result &= not m.contains_key(str(key + 1))
+    print(result)
+
+    print("\nremove and get_keys_and_values example 1")
+    print("----------------------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.remove('1')
+    m.put('2', '200')
+    print(m.get_keys_and_values())
+    m.resize_table(2)
+    print(m.get_keys_and_values(), m.get_capacity())
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+
+    print("\nstats example 1")
+    print("---------------")
+    m = HashMap(11, hash_function_1, max_load=0.9)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    for i in range(0, 1000, 2):
+        m.remove('key' + str(i))
+    stats = m.stats()
+    print(stats['size'], stats['capacity'], stats['max_probe_length'], round(stats['mean_probe_length'], 2))
+    try:
+        HashMap(11, hash_function_1, max_load=1)
+    except ValueError as error:
+        print(error)
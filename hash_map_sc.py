@@ -13,21 +13,48 @@
 
 
 
-from a6_include import (DynamicArray, LinkedList,
+import time
+
+from a6_include import (DynamicArray, HashMapIterator, HashMapView, LinkedList, SLNode,
                         hash_function_1, hash_function_2)
+from capacity_planner import is_prime, next_prime
+from snapshot import collection_paused, layout_is_valid, read_snapshot, write_snapshot
+
+# number of old buckets that each operation moves into the new table while an incremental resize is in progress
+MIGRATE_BUCKETS = 4
+
+# the constructor options a snapshot may hold, and their types
+_SNAPSHOT_OPTIONS = {'incremental_resize': bool, 'shrink_load': (int, float, type(None))}
 
 
 class HashMap:
     def __init__(self,
                  capacity: int = 11,
-                 function: callable = hash_function_1) -> None:
+                 function: callable = hash_function_1,
+                 incremental_resize: bool = False,
+                 expected_size: int = None,
+                 shrink_load: float = None) -> None:
         """
         Initialize new HashMap that uses
-        separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        separate chaining for collision resolution.
+        If incremental_resize is True, then growing the table moves
+        the old buckets over a little at a time on each operation,
+        instead of rehashing the whole table in a single put.
+        If expected_size is given, then the capacity is raised so that
+        many key/value pairs can be put without resizing the table.
+        If shrink_load is given, then the table is resized down once removals
+        drop the load factor below it, so memory is given back after a burst
+        of removals. It is off by default, and must be above 0 and at most
+        0.25, so a shrink leaves the load factor at most half of the 1
+        that put grows the table at.
         """
+        if shrink_load is not None and not 0 < 2 * shrink_load <= 0.5:
+            raise ValueError('shrink_load must be above 0 and at most 0.25')
         self._buckets = DynamicArray()
 
+        if expected_size is not None:
+            capacity = max(capacity, self._capacity_for(expected_size))
+
         # capacity must be a prime number
         self._capacity = self._next_prime(capacity)
         for _ in range(self._capacity):
@@ -35,6 +62,25 @@ class HashMap:
 
         self._hash_function = function
         self._size = 0
+        self._version = 0 # incremented whenever the contents of the buckets change, so iterators can detect it
+        self._occupied = 0 # number of non-empty buckets in _buckets, so empty_buckets doesn't have to count them
+
+        # while an incremental resize is in progress, the buckets below
+        # _migrate_index of the old table have been moved into _buckets,
+        # and the new buckets below _fill_index hold their linked lists
+        self._incremental_resize = incremental_resize
+        self._shrink_load = shrink_load # low-water load factor, or None to never shrink
+        self._min_capacity = self._capacity # the table never shrinks below the capacity it was created with
+        self._old_buckets = None
+        self._old_capacity = 0
+        self._migrate_index = 0
+        self._fill_index = 0
+
+        self._resize_count = 0 # number of times the table has been rebuilt
+        self._resize_time = 0.0 # total seconds spent rebuilding the table
+        self._migration_time = 0.0 # seconds spent on the incremental resize in progress
+        self._counters = None # per-operation counters, only kept once enable_counters is called
+        self._hook = None
 
     def __str__(self) -> str:
         """
@@ -49,35 +95,15 @@ class HashMap:
     def _next_prime(self, capacity: int) -> int:
         """
         Increment from given number and the find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity % 2 == 0:
-            capacity += 1
-
-        while not self._is_prime(capacity):
-            capacity += 2
-
-        return capacity
+        return next_prime(capacity) # the capacity planner tests each candidate with Miller-Rabin instead of trial division
 
     @staticmethod
     def _is_prime(capacity: int) -> bool:
         """
         Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
         """
-        if capacity == 2 or capacity == 3:
-            return True
-
-        if capacity == 1 or capacity % 2 == 0:
-            return False
-
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
-
-        return True
+        return is_prime(capacity)
 
     def get_size(self) -> int:
         """
@@ -105,28 +131,30 @@ class HashMap:
         then doubles the hash maps current capacity.
         """
 
+        if self._old_buckets is not None: # if an incremental resize is in progress, then move a few more old buckets first
+            self._migrate()
+
         load_factor = self.table_load()
         if load_factor >= 1.0 :  # if the load factor is greater than 1.0, then double the capacity of the hash table
-            self.resize_table(self._capacity * 2)
+            if self._incremental_resize:
+                self._start_migration(self._resized_capacity(self._capacity * 2))
+            else:
+                self.resize_table(self._capacity * 2)
 
         hash = self._hash_function(key)
-        index = hash % self._capacity # this is the index in the hash table that corresponds to the given key/value pair
-        linked_list = self._buckets.get_at_index(index) # this is the linked list at the index in the hash table that corresponds to the key/value pair.
-        list_size = linked_list.length()
-        if list_size == 0: # if the linked list contains no key/value pairs, then just insert a new node containing the new key/value pair into the list.
-            linked_list.insert(key, value)
-            self._size +=1
+        linked_list = self._bucket_for(hash) # this is the linked list in the hash table that corresponds to the key/value pair.
+        if self._counters is not None:
+            self._record('put', key, linked_list)
+        list_node = linked_list.contains(key, hash) # walk the chain once, looking for a node that already holds the given key
+        if list_node is not None: # if the linked list contains the given key, then replace that key's value with the given value.
+            list_node.value = value # in this case, we don't increase the hash map's size.
             return
 
-        if list_size != 0 and linked_list.contains(key)== None: # if the linked list is not empty, and does not contain the given key, then just insert a new node containing the new key/value pair into the list.
-            linked_list.insert(key, value)
-            self._size +=1
-            return
-
-        if list_size != 0 and linked_list.contains(key) != None: # if the linked list is not empty, and contains the given key, then replace that key's value with the given value.
-                for list_node in linked_list:
-                    if list_node.key == key:
-                        list_node.value = value # in this case, we don't increase the hash map's size.
+        if linked_list.length() == 0 and not self._in_old_table(hash): # the bucket is about to stop being empty
+            self._occupied += 1
+        linked_list.insert(key, value, hash) # else, the key isn't in the list, so just insert a new node containing the new key/value pair at the front of the list.
+        self._size +=1
+        self._version += 1
 
     def resize_table(self, new_capacity: int) -> None:
         """
@@ -141,32 +169,171 @@ class HashMap:
         if new_capacity < 1: # if the given capacity is less than 1, then don't do anything
             return
 
-        else:
-            if new_capacity == 2: # if the given capacity is 2 (this is an edge case), then don't call the next_prime method
-                self._capacity == 2
-            else:
-                new_capacity = self._next_prime(new_capacity) # if the new capacity is prime, then we use that capacity, if otherwise, then we find the next prime.
-            buckets = self._buckets # variable to hold the hash maps previous buckets
-            buckets_size = buckets.length()
-            index1 = 0
-            self._buckets = DynamicArray() # clear the content's of the hash table
-            self._size = 0 # reset the hash table's size to 0
-            self._capacity = new_capacity # set the hash table's capacity to the given capacity
-
-            while index1 < new_capacity: # refill the hash map with empty linked lists (in the amount of the given capacity)
-                self._buckets.append(LinkedList())
-                index1 += 1
-
-            index2 = 0
-            while index2 < buckets_size: # this loop will take the hash maps previous contents, and insert it into the hash map after the capacity has been updated
-                if buckets[index2].length() == 0: # if the link list is empty, there is no need to add it.
-                    index2 +=1
-                    continue
-                else: # if the linked list is not empty, then insert the previous key/value pairs into the updated hash map.
-                    linked_list = buckets.get_at_index(index2)
-                    for list_node in linked_list:
-                        self.put(list_node.key, list_node.value)
-                index2 +=1
+        self._finish_migration() # an incremental resize in progress must be completed before the table can be rebuilt
+        new_capacity = self._resized_capacity(new_capacity) # if the new capacity is prime, then we use that capacity, if otherwise, then we find the next prime.
+        while self._size > new_capacity: # the table still has to hold every pair with a load factor below 1, so keep doubling the capacity, just like put would
+            new_capacity = self._resized_capacity(new_capacity * 2)
+        self._rehash(new_capacity)
+
+    def _shrink(self) -> None:
+        """
+        This method takes no parameters. Once removals have dropped the load factor below the
+        low-water mark, the method resizes the table down so that the load factor becomes twice
+        the low-water mark, which __init__ keeps at or below 0.5, half of the load factor put grows
+        the table at. This leaves a gap on both sides, so the table doesn't keep switching between
+        growing and shrinking. The table never shrinks below the capacity it was created with.
+        """
+        target_load = 2 * self._shrink_load
+        new_capacity = max(int(self._size / target_load) + 1, self._min_capacity)
+        if self._resized_capacity(new_capacity) < self._capacity: # the table is already as small as it is allowed to get
+            self.resize_table(new_capacity)
+
+    def _resized_capacity(self, new_capacity: int) -> int:
+        """
+        This method takes a requested capacity as its parameter. The method returns
+        the capacity that resize_table will use, which is the next prime number. A
+        requested capacity of 2 is an edge case and is used as it is.
+        """
+        if new_capacity == 2: # if the given capacity is 2 (this is an edge case), then don't call the next_prime method
+            return new_capacity
+        return self._next_prime(new_capacity)
+
+    @staticmethod
+    def _capacity_for(expected_size: int) -> int:
+        """
+        This method takes a number of key/value pairs as its parameter. The method returns the
+        smallest capacity that holds that many pairs without put resizing the table. put resizes
+        once the load factor reaches 1 before a new pair is added, so the capacity must be at
+        least the number of pairs.
+        """
+        return max(expected_size, 1)
+
+    def _rehash(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method moves every
+        node into a bucket array of the new capacity. The bucket array is allocated
+        once, and the existing nodes are relinked into their new buckets, so no load
+        factor or duplicate checks are made and no new nodes are created.
+        """
+        start = time.perf_counter()
+        buckets = self._buckets # variable to hold the hash maps previous buckets
+        buckets_size = buckets.length()
+        self._buckets = DynamicArray([LinkedList() for _ in range(new_capacity)]) # allocate all the new empty linked lists at once
+        self._capacity = new_capacity # set the hash table's capacity to the given capacity
+        self._occupied = 0
+        self._version += 1 # the nodes are about to be relinked into new buckets
+
+        index = 0
+        while index < buckets_size: # this loop will take the hash maps previous contents, and move it into the hash map after the capacity has been updated
+            linked_list = buckets.get_unchecked(index)
+            if linked_list.length() != 0: # if the link list is empty, there is no need to move it.
+                for list_node in linked_list: # the iterator has already advanced past the node, so it is safe to relink it
+                    new_index = list_node.hash % new_capacity # the node keeps its key's hash, so the key doesn't need to be hashed again
+                    new_list = self._buckets.get_unchecked(new_index)
+                    if new_list.length() == 0:
+                        self._occupied += 1
+                    new_list.insert_node(list_node)
+            index += 1
+
+        elapsed = time.perf_counter() - start
+        self._resize_time += elapsed
+        self._resize_count += 1
+        self._notify_resize(elapsed)
+
+    def _bucket_for(self, hash: int) -> LinkedList:
+        """
+        This method takes a hash as its parameter. The method returns the linked list
+        that holds the keys with that hash. While an incremental resize is in progress,
+        this is the bucket of the old table if that bucket hasn't been moved yet.
+        """
+        if self._old_buckets is not None:
+            if self._in_old_table(hash): # the old bucket hasn't been moved into the new table yet
+                return self._old_buckets.get_unchecked(hash % self._old_capacity)
+            return self._new_bucket(hash % self._capacity)
+        return self._buckets.get_unchecked(hash % self._capacity)
+
+    def _in_old_table(self, hash: int) -> bool:
+        """
+        This method takes a hash as its parameter. The method returns True if an incremental
+        resize is in progress and the old bucket for that hash hasn't been moved yet.
+        """
+        return self._old_buckets is not None and hash % self._old_capacity >= self._migrate_index
+
+    def _new_bucket(self, index: int) -> LinkedList:
+        """
+        This method takes an index as its parameter. While an incremental resize is in
+        progress, the method returns the linked list at that index of the new table,
+        creating it first if the bucket hasn't been filled yet.
+        """
+        linked_list = self._buckets.get_unchecked(index)
+        if linked_list is None:
+            linked_list = LinkedList()
+            self._buckets.set_unchecked(index, linked_list)
+        return linked_list
+
+    def _start_migration(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method starts an
+        incremental resize. The current buckets become the old table, and a new
+        table of the new capacity takes their place. The nodes are moved over
+        later by _migrate, which also fills the new buckets with their empty
+        linked lists a few at a time, so no step has to create them all at once.
+        """
+        self._finish_migration() # only one incremental resize can be in progress at a time
+        self._old_buckets, self._old_capacity = self._buckets, self._capacity
+        self._migrate_index = 0
+        self._fill_index = 0
+        self._buckets = DynamicArray.filled(new_capacity)
+        self._capacity = new_capacity
+        self._occupied = 0
+        self._version += 1
+        self._migration_time = 0.0
+
+    def _migrate(self, count: int = MIGRATE_BUCKETS) -> None:
+        """
+        This method takes a number of buckets as its parameter. The method moves that many
+        buckets of the old table into the new table, relinking their nodes. Once every old
+        bucket has been moved, the old table is dropped and the incremental resize is done.
+        """
+        start = time.perf_counter()
+        stop = min(self._migrate_index + count, self._old_capacity)
+        while self._migrate_index < stop:
+            linked_list = self._old_buckets.get_unchecked(self._migrate_index)
+            for list_node in linked_list: # the iterator has already advanced past the node, so it is safe to relink it
+                new_list = self._new_bucket(list_node.hash % self._capacity)
+                if new_list.length() == 0:
+                    self._occupied += 1
+                new_list.insert_node(list_node)
+            self._migrate_index += 1
+
+        # fill the new buckets at the same pace as the old buckets are moved, so they are all filled by the end
+        fill_stop = self._capacity
+        if self._migrate_index < self._old_capacity:
+            fill_stop = self._capacity * self._migrate_index // self._old_capacity
+        while self._fill_index < fill_stop:
+            self._new_bucket(self._fill_index)
+            self._fill_index += 1
+
+        elapsed = time.perf_counter() - start
+        self._resize_time += elapsed
+        self._migration_time += elapsed
+
+        if self._migrate_index == self._old_capacity: # every old bucket has been moved
+            self._old_buckets = None
+            self._old_capacity = 0
+            self._migrate_index = 0
+            self._fill_index = 0
+            self._resize_count += 1
+            self._notify_resize(self._migration_time)
+            self._migration_time = 0.0
+
+    def _finish_migration(self) -> None:
+        """
+        This method takes no parameters. If an incremental resize is in progress,
+        then the method moves all the remaining old buckets into the new table.
+        """
+        if self._old_buckets is not None:
+            self._migrate(self._old_capacity)
 
     def table_load(self) -> float:
         """
@@ -180,17 +347,11 @@ class HashMap:
     def empty_buckets(self) -> int:
         """
         This method takes no parameters. The method returns the number
-        of empty buckets that are currently in the hash table.
+        of empty buckets that are currently in the hash table. While an
+        incremental resize is in progress, the count is for the new table,
+        which the nodes still in the old table haven't reached yet.
         """
-        count = 0 # used to keep count of the empty buckets
-        index = 0
-        hash_map_capacity = self.get_capacity()
-        while index < hash_map_capacity: # iterate through the hash table and count all the empty linked lists.
-            linked_list = self._buckets.get_at_index(index)
-            if linked_list.length() == 0: # if the linked list is empty, then the bucket is empty.
-                count += 1 # add 1 to the count
-            index += 1
-        return count
+        return self._capacity - self._occupied # the non-empty buckets are counted as nodes are added and removed
 
     def get(self, key: str):
         """
@@ -199,12 +360,16 @@ class HashMap:
         then the method returns None.
         """
 
+        if self._old_buckets is not None: # if an incremental resize is in progress, then move a few more old buckets first
+            self._migrate()
+
         hash = self._hash_function(key)
-        index = hash % self._capacity # the index of the bucket which possibly contains given key
-        linked_list = self._buckets.get_at_index(index) # get the specific bucket that possibly contains the given key
-        for list_node in linked_list: # iterate through the linked list, and if a node in the linked list contains the given key, then return its associated value
-            if list_node.key == key:
-                return list_node.value
+        linked_list = self._bucket_for(hash) # get the specific bucket that possibly contains the given key
+        if self._counters is not None:
+            self._record('get', key, linked_list)
+        list_node = linked_list.contains(key, hash) # walk the linked list, comparing the cached hashes before the keys
+        if list_node is not None: # if a node in the linked list contains the given key, then return its associated value
+            return list_node.value
 
         return None # The key isn't in the hash map, so just return None
 
@@ -215,14 +380,14 @@ class HashMap:
         then the method returns False.
         """
 
-        hash = self._hash_function(key)
-        index = hash % self._capacity # the index of the bucket which possibly contains given key
-        linked_list = self._buckets.get_at_index(index) # get the specific bucket that possibly contains the given key
-        for list_node in linked_list: # iterate through the linked list, and if a node in the linked list contains the given key, then return True
-            if list_node.key == key:
-                return True
+        if self._old_buckets is not None: # if an incremental resize is in progress, then move a few more old buckets first
+            self._migrate()
 
-        return False # The key isn't in the hash map, so just return False
+        hash = self._hash_function(key)
+        linked_list = self._bucket_for(hash) # get the specific bucket that possibly contains the given key
+        if self._counters is not None:
+            self._record('contains_key', key, linked_list)
+        return linked_list.contains(key, hash) is not None # walk the linked list, comparing the cached hashes before the keys
 
     def remove(self, key: str) -> None:
         """
@@ -231,17 +396,142 @@ class HashMap:
         in the hash map, then the method does nothing.
         """
 
+        if self._old_buckets is not None: # if an incremental resize is in progress, then move a few more old buckets first
+            self._migrate()
+
         hash = self._hash_function(key)
-        index = hash % self._capacity
-        linked_list = self._buckets.get_at_index(index) # get the specific bucket that possibly contains the given key
-        if linked_list.contains(key) is not None: # if the linked lists's contain method returns the key, then remove the node containing that key.
-            for list_node in linked_list:
-                if list_node.key == key: # if the given key matches the key in node, then remove it and its value
-                    linked_list.remove(key)
-                    self._size -=1 # decrease the map's size by 1
-        else: # else, the key was not found, so the method does nothing.
+        linked_list = self._bucket_for(hash) # get the specific bucket that possibly contains the given key
+        if self._counters is not None:
+            self._record('remove', key, linked_list)
+        if linked_list.remove(key, hash): # the linked list's remove method unlinks the node in a single walk, and returns True if the key was found
+            self._size -=1 # decrease the map's size by 1
+            self._version += 1
+            if linked_list.length() == 0 and not self._in_old_table(hash): # the bucket has just become empty
+                self._occupied -= 1
+            if self._shrink_load is not None and self._size < self._shrink_load * self._capacity:
+                self._shrink()
+        # else, the key was not found, so the method does nothing.
+
+    def put_many(self, pairs) -> None:
+        """
+        This method takes an iterable of key/value pairs as its parameter. The method puts every
+        pair into the hash map, just like calling put for each of them, and later pairs replace the
+        values of earlier pairs with the same key. The table is resized at most once, up front, so
+        that it can hold all the incoming pairs, and then the keys are hashed in bulk and linked into
+        their buckets without a load factor check per pair.
+        """
+
+        if self._counters is not None or self._old_buckets is not None: # counted operations are reported one by one, and an incremental resize moves a few buckets per key, so take the single key path
+            for key, value in pairs:
+                self.put(key, value)
+            return
+
+        if not isinstance(pairs, list): # the pairs are counted before they are inserted, so a generator has to be read first
+            pairs = list(pairs)
+        self._put_hashed(pairs, list(map(self._hash_function, [pair[0] for pair in pairs])))
+
+    def _put_hashed(self, pairs: list, hashes) -> None:
+        """
+        This method takes a list of key/value pairs and the hash of each key as its parameters. The
+        method puts every pair into the hash map the way put_many does, without hashing the keys
+        again. No incremental resize may be in progress.
+        """
+        if self._size + len(pairs) > self._capacity: # presize once, so that put's load factor would never have reached 1 during the batch
+            self.resize_table(self._size + len(pairs))
+
+        buckets = self._buckets
+        capacity = self._capacity
+        for (key, value), hash in zip(pairs, hashes):
+            linked_list = buckets.get_unchecked(hash % capacity)
+            list_node = linked_list.contains(key, hash)
+            if list_node is not None: # the key is already in the hash map, or earlier in the batch, so replace its value
+                list_node.value = value
+                continue
+            if linked_list.length() == 0:
+                self._occupied += 1
+            linked_list.insert(key, value, hash)
+            self._size += 1
+            self._version += 1
+
+    @classmethod
+    def from_pairs(cls, pairs, expected_size: int = None, function: callable = hash_function_1) -> "HashMap":
+        """
+        This method takes an iterable of key/value pairs, the expected number of pairs and a hash
+        function as its parameters. The method returns a new hash map holding the given pairs. The
+        capacity is chosen up front for the expected number of pairs, so building the hash map
+        doesn't resize the table. If expected_size is not given, then the pairs are counted first.
+        """
+        if expected_size is None:
+            if not isinstance(pairs, list):
+                pairs = list(pairs)
+            expected_size = len(pairs)
+        hash_map = cls(1, function, expected_size=expected_size)
+        hash_map.put_many(pairs)
+        return hash_map
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        This method takes an iterable of keys as its parameter. The method returns a DynamicArray
+        holding the value associated with each key, in the same order as the keys. A key that
+        is not in the hash map gets None, just like get.
+        """
+
+        if self._counters is not None or self._old_buckets is not None: # counted operations are reported one by one, and an incremental resize moves a few buckets per key, so take the single key path
+            return DynamicArray([self.get(key) for key in keys])
+
+        if not isinstance(keys, list):
+            keys = list(keys)
+        buckets = self._buckets
+        capacity = self._capacity
+        values = []
+        for key, hash in zip(keys, map(self._hash_function, keys)):
+            list_node = buckets.get_unchecked(hash % capacity).contains(key, hash)
+            values.append(list_node.value if list_node is not None else None)
+        return DynamicArray(values)
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        This method takes an iterable of keys as its parameter. The method returns a DynamicArray
+        holding True for each key that is in the hash map and False for each key that isn't,
+        in the same order as the keys.
+        """
+
+        if self._counters is not None or self._old_buckets is not None: # counted operations are reported one by one, and an incremental resize moves a few buckets per key, so take the single key path
+            return DynamicArray([self.contains_key(key) for key in keys])
+
+        if not isinstance(keys, list):
+            keys = list(keys)
+        buckets = self._buckets
+        capacity = self._capacity
+        return DynamicArray([buckets.get_unchecked(hash % capacity).contains(key, hash) is not None
+                             for key, hash in zip(keys, map(self._hash_function, keys))])
+
+    def remove_many(self, keys) -> None:
+        """
+        This method takes an iterable of keys as its parameter. The method removes each
+        key that is in the hash map, along with its associated value. Keys that are not in
+        the hash map are skipped, just like remove.
+        """
+
+        if self._counters is not None or self._old_buckets is not None: # counted operations are reported one by one, and an incremental resize moves a few buckets per key, so take the single key path
+            for key in keys:
+                self.remove(key)
             return
 
+        if not isinstance(keys, list):
+            keys = list(keys)
+        buckets = self._buckets
+        capacity = self._capacity
+        for key, hash in zip(keys, map(self._hash_function, keys)):
+            linked_list = buckets.get_unchecked(hash % capacity)
+            if linked_list.remove(key, hash):
+                self._size -= 1
+                self._version += 1
+                if linked_list.length() == 0: # the bucket has just become empty
+                    self._occupied -= 1
+
+        if self._shrink_load is not None and self._size < self._shrink_load * self._capacity:
+            self._shrink() # the load factor is only checked once, after the whole batch has been removed
 
     def get_keys_and_values(self) -> DynamicArray:
         """
@@ -250,10 +540,11 @@ class HashMap:
         stored in the hash map.
         """
 
+        self._finish_migration() # make sure every node is in the current buckets
         key_value_arr = DynamicArray() # create a DynamicArray which will contain the tuples of key/value pairs
         index = 0
         while index < self._buckets.length() : # iterate through the buckets
-                linked_list = self._buckets[index]
+                linked_list = self._buckets.get_unchecked(index) # the index is always in range, so skip the bounds check
                 for list_node in linked_list: # iterate through all the nodes in the linked list, and append their associated key/value pairs into the array
                     key_val_tuple = (list_node.key, list_node.value)
                     key_value_arr.append(key_val_tuple) # append the tuple containing the key/value pair
@@ -261,18 +552,269 @@ class HashMap:
 
         return key_value_arr # return the array
 
+    def export(self, sink, separator: str = '\t') -> int:
+        """
+        This method takes a sink, and optionally a separator, as its parameters. The method
+        streams every key/value pair that is currently stored in the hash map into the sink,
+        without building a DynamicArray of tuples first, and returns the number of pairs
+        exported. The sink can be:
+        - a callable, which is called with each key and its value
+        - a file (any object with a write method), which gets one line per pair, holding
+          the key and the value converted to strings and joined by the separator
+        - a pair of columns (keys column, values column), such as lists or arrays from the
+          array module, which the keys and values are appended to. A memoryview column is
+          filled in by index from 0 instead, so it must be at least as long as the hash
+          map's size, otherwise a ValueError is raised before anything is written.
+        """
+        if callable(sink):
+            for node in self: # walk the nodes in place, nothing is copied
+                sink(node.key, node.value)
+            return self._size
+
+        if hasattr(sink, 'write'):
+            write = sink.write
+            for node in self:
+                write(str(node.key) + separator + str(node.value) + '\n')
+            return self._size
+
+        keys_column, values_column = sink
+        for column in (keys_column, values_column):
+            if isinstance(column, memoryview) and len(column) < self._size:
+                raise ValueError('column of length ' + str(len(column)) + ' is too short for ' +
+                                 str(self._size) + ' key/value pairs')
+
+        add_key = None if isinstance(keys_column, memoryview) else keys_column.append
+        add_value = None if isinstance(values_column, memoryview) else values_column.append
+        index = 0
+        for node in self:
+            if add_key is None:
+                keys_column[index] = node.key
+            else:
+                add_key(node.key)
+            if add_value is None:
+                values_column[index] = node.value
+            else:
+                add_value(node.value)
+            index += 1
+        return index
+
+    def save(self, path: str) -> None:
+        """
+        This method takes a file path as its parameter. The method saves the hash map to the file
+        as a snapshot (see snapshot.py) holding its capacity, options and hash function, and the
+        bucket index, stored hash, key and value of every node, in the order of each bucket's
+        linked list. The keys and values must be picklable.
+        """
+        indices, hashes, keys, values, _ = self._layout()
+        write_snapshot(path, 'separate chaining', self._hash_function, self._capacity, self._min_capacity,
+                       {'incremental_resize': self._incremental_resize, 'shrink_load': self._shrink_load},
+                       indices, hashes, keys, values)
+
+    def _layout(self) -> tuple:
+        """
+        This method takes no parameters. The method returns the bucket layout of the hash map as
+        flat lists: the bucket index, stored hash, key and value of every node, in the order of each
+        bucket's linked list, and an empty list of tombstones, so it matches the open addressing
+        HashMap. Flat lists pickle without recursing along the chains.
+        """
+        self._finish_migration() # make sure every node is in the current buckets
+        indices, hashes, keys, values = [], [], [], []
+        index = 0
+        while index < self._capacity:
+            for node in self._buckets.get_unchecked(index):
+                indices.append(index)
+                hashes.append(node.hash)
+                keys.append(node.key)
+                values.append(node.value)
+            index += 1
+        return indices, hashes, keys, values, []
+
+    @classmethod
+    def load(cls, path: str, function: callable = hash_function_1) -> "HashMap":
+        """
+        This method takes a file path and a hash function as its parameters. The method returns the
+        hash map saved to the file by save. If the given hash function is the one the hash map was
+        saved with, and it still gives the stored hashes, then every node is put straight back into
+        its bucket, so no key is hashed and no table is resized. Otherwise the keys are hashed again
+        with the given hash function and put into a table of the saved capacity.
+        """
+        snapshot = read_snapshot(path, 'separate chaining', _SNAPSHOT_OPTIONS)
+        keys, values = snapshot['keys'], snapshot['values']
+        capacity = snapshot['capacity']
+        if not layout_is_valid(snapshot, function): # the stored hashes can't be trusted, so hash every key again
+            hash_map = cls(capacity, function, **snapshot['options'])
+            hash_map.put_many(zip(keys, values))
+            return hash_map
+
+        return cls._from_layout(function, capacity, snapshot['min_capacity'], snapshot['options'],
+                                snapshot['indices'], snapshot['hashes'], keys, values)
+
+    @classmethod
+    def _from_layout(cls, function: callable, capacity: int, min_capacity: int, options: dict,
+                     indices, hashes, keys, values, tombstones=()) -> "HashMap":
+        """
+        This method takes a hash function, a capacity, a minimum capacity, constructor options, and
+        a bucket layout in the form _layout returns it as its parameters. The method returns a new
+        hash map with every node put straight back into its bucket, so no key is hashed. The layout
+        must have been made with the same hash function and capacity. A separate chaining table has
+        no tombstones, so tombstones is ignored.
+        """
+        hash_map = cls(1, function, **options)
+        heads = [None] * capacity
+        sizes = [0] * capacity
+        with collection_paused():
+            # each node is linked in front of the nodes that follow it in its chain, so go backwards to keep the saved order
+            for index, hash, key, value in zip(reversed(indices), reversed(hashes), reversed(keys), reversed(values)):
+                heads[index] = SLNode(key, value, heads[index], hash)
+                sizes[index] += 1
+            buckets = list(map(LinkedList.from_chain, heads, sizes)) # each bucket's head is set once
+
+        hash_map._buckets = DynamicArray(buckets)
+        hash_map._capacity = capacity
+        hash_map._min_capacity = min_capacity
+        hash_map._size = len(keys)
+        hash_map._occupied = capacity - sizes.count(0)
+        return hash_map
+
     def clear(self) -> None:
         """
         This method takes no parameters. The method clears the content that is
         currently in the hash map. The method does not change the hash table's
         underlying capacity.
         """
-        linked_list = LinkedList()
+        self._old_buckets = None # drop the old table of an incremental resize in progress
+        self._old_capacity = 0
+        self._migrate_index = 0
+        self._fill_index = 0
         index = 0
-        while index < self._capacity: # iterate through the hash table's capacity and make each bucket an empty linked list
-            self._buckets[index] = linked_list
+        while index < self._capacity: # iterate through the hash table's capacity and make each bucket its own empty linked list
+            self._buckets.set_unchecked(index, LinkedList()) # the buckets must not share a list, since resizing relinks the nodes of every bucket
             index +=1
         self._size = 0 # reset the size to 0
+        self._occupied = 0
+        self._version += 1
+
+    def stats(self) -> dict:
+        """
+        This method takes no parameters. The method returns a dictionary of statistics
+        about the hash table: its size, capacity, load factor and number of empty buckets,
+        a histogram of the chain lengths (chain length: number of buckets), the longest
+        chain, the mean length of the non-empty chains, how many times the table has been
+        resized, and the total seconds spent resizing. While an incremental resize is in
+        progress, the old buckets that haven't been moved yet are counted along with the
+        new table's, since a lookup may walk either, and nothing is moved.
+        """
+        tables = [(self._buckets, 0, self._capacity)]
+        if self._old_buckets is not None:
+            tables.append((self._old_buckets, self._migrate_index, self._old_capacity))
+        histogram = {}
+        longest = 0
+        for buckets, index, stop in tables:
+            while index < stop: # count the chain length of every bucket
+                linked_list = buckets.get_unchecked(index)
+                length = 0 if linked_list is None else linked_list.length() # a new bucket that hasn't been filled yet is empty
+                histogram[length] = histogram.get(length, 0) + 1
+                if length > longest:
+                    longest = length
+                index += 1
+
+        non_empty = sum(histogram.values()) - histogram.get(0, 0)
+        return {
+            'size': self._size,
+            'capacity': self._capacity,
+            'table_load': self.table_load(),
+            'empty_buckets': self._capacity - self._occupied, # only the new table's buckets
+            'chain_length_histogram': histogram,
+            'max_chain_length': longest,
+            'mean_chain_length': self._size / non_empty if non_empty else 0.0,
+            'resize_count': self._resize_count,
+            'resize_time': self._resize_time,
+        }
+
+    def enable_counters(self, hook: callable = None) -> None:
+        """
+        This method takes an optional hook as its parameter. The method starts counting the
+        put, get, contains_key, remove and resize operations, along with the total number of
+        probes, which for this map is the number of nodes of the chain an operation walks
+        through. If a hook is given, it is called as hook(operation, probes) after each
+        operation is counted, and as hook('resize', seconds) after each resize, so the
+        counts can be exported to a metrics pipeline.
+        """
+        self._counters = {'put': 0, 'get': 0, 'contains_key': 0, 'remove': 0, 'resize': 0, 'probes': 0}
+        self._hook = hook
+
+    def disable_counters(self) -> None:
+        """
+        This method takes no parameters. The method stops counting operations.
+        """
+        self._counters = None
+        self._hook = None
+
+    def get_counters(self) -> dict:
+        """
+        This method takes no parameters. The method returns a copy of the operation
+        counters, or None if counting isn't enabled.
+        """
+        if self._counters is None:
+            return None
+        return dict(self._counters)
+
+    def _record(self, operation: str, key: str, linked_list: LinkedList) -> None:
+        """
+        This method takes an operation name, a key and the key's linked list as its parameters.
+        The method counts the operation and the nodes it walks through: up to and including the
+        key's node if the key is in the list, or the whole list if it isn't.
+        """
+        probes = 0
+        for list_node in linked_list:
+            probes += 1
+            if list_node.key == key:
+                break
+        self._counters[operation] += 1
+        self._counters['probes'] += probes
+        if self._hook is not None:
+            self._hook(operation, probes)
+
+    def _notify_resize(self, seconds: float) -> None:
+        """
+        This method takes the seconds a resize took as its parameter. If counting is
+        enabled, then the method counts the resize and passes it on to the hook.
+        """
+        if self._counters is not None:
+            self._counters['resize'] += 1
+            if self._hook is not None:
+                self._hook('resize', seconds)
+
+    def __iter__(self) -> HashMapIterator:
+        """
+        This method takes no parameters. The method returns a new iterator over the
+        SLNodes of the hash map, so several iterations can be in progress at once.
+        """
+        return HashMapIterator(self)
+
+    def keys(self) -> HashMapView:
+        """
+        This method takes no parameters. The method returns a view of the keys that are
+        currently in the hash map. The view doesn't copy the keys, it walks the hash table
+        each time it is iterated over.
+        """
+        return HashMapView(self, 'keys')
+
+    def values(self) -> HashMapView:
+        """
+        This method takes no parameters. The method returns a view of the values that are
+        currently in the hash map. The view doesn't copy the values, it walks the hash table
+        each time it is iterated over.
+        """
+        return HashMapView(self, 'values')
+
+    def items(self) -> HashMapView:
+        """
+        This method takes no parameters. The method returns a view of the key/value tuples
+        that are currently in the hash map. The view doesn't copy the key/value pairs, it
+        walks the hash table each time it is iterated over.
+        """
+        return HashMapView(self, 'items')
 
 def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
     """
@@ -324,6 +866,11 @@ def find_mode(da: DynamicArray) -> tuple[DynamicArray, int]:
 
 if __name__ == "__main__":
 
+    import array # for the export and snapshot examples
+    import io
+    import os
+    import tempfile
+
     print("\nPDF - put example 1")
     print("-------------------")
     m = HashMap(53, hash_function_1)
@@ -520,3 +1067,132 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nincremental resize example 1")
+    print("----------------------------")
+    m = HashMap(11, hash_function_2, incremental_resize=True)
+    for i in range(200):
+        m.put('key' + str(i), i)
+        if i % 50 == 49:
+            print(m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+    result = True
+    for i in range(200):
+        result &= m.get('key' + str(i)) == i
+    print(result, m.contains_key('key200'))
+
+    print("\nstats example 1")
+    print("---------------")
+    m = HashMap(53, hash_function_1)
+    events = []
+    m.enable_counters(lambda operation, amount: events.append(operation))
+    for i in range(150):
+        m.put('key' + str(i), i)
+    for i in range(0, 150, 3):
+        m.get('key' + str(i))
+        m.remove('key' + str(i))
+    stats = m.stats()
+    print(stats['size'], stats['capacity'], stats['resize_count'], m.get_counters()['put'], m.get_counters()['remove'], len(events))
+
+    print("\nstats example 2")
+    print("---------------")
+    m = HashMap(11, hash_function_1, incremental_resize=True)
+    for i in range(60):
+        m.put('key' + str(i), i)
+    stats = m.stats() # taken in the middle of an incremental resize, which it leaves alone
+    histogram = stats['chain_length_histogram']
+    print(stats['size'], sum(length * count for length, count in histogram.items()), stats['resize_count'], m.stats() == stats)
+
+    print("\nbatch example 1")
+    print("---------------")
+    m = HashMap(11, hash_function_1)
+    m.put_many(('key' + str(i), i) for i in range(100))
+    print(m.get_size(), m.get_capacity(), m.stats()['resize_count'])
+    print(m.get_many(['key0', 'key42', 'key100']))
+    print(m.contains_many(['key0', 'key42', 'key100']))
+    m.remove_many('key' + str(i) for i in range(0, 100, 2))
+    print(m.get_size(), m.contains_many(['key0', 'key1']))
+
+    print("\nfrom_pairs example 1")
+    print("--------------------")
+    m = HashMap.from_pairs([('key' + str(i), i) for i in range(1000)])
+    print(m.get_size(), m.get_capacity(), m.stats()['resize_count'], m.get('key999'))
+    m = HashMap(11, hash_function_2, expected_size=1000)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity(), m.stats()['resize_count'])
+
+    print("\nshrink example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1, shrink_load=0.25)
+    for i in range(1000):
+        m.put('key' + str(i), i)
+    print(m.get_size(), m.get_capacity())
+    for i in range(900):
+        m.remove('key' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get('key950'), m.contains_key('key0'))
+    try:
+        HashMap(11, hash_function_1, shrink_load=0.4)
+    except ValueError as error:
+        print(error)
+
+    print("\nviews example 1")
+    print("---------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), i * 10)
+    keys = m.keys()
+    print(len(keys), '3' in keys, '9' in keys, 30 in m.values(), ('4', 40) in m.items())
+    print(sorted(keys), sorted(m.values()))
+    pairs = 0
+    for key in keys: # two iterations over the same map can be in progress at once
+        for other in keys:
+            pairs += 1
+    print(pairs)
+    m.put('6', 60)
+    print(len(keys), sorted(m.items())[-1])
+    try:
+        for key in m.keys():
+            m.remove(key)
+    except RuntimeError as error:
+        print(error, m.get_size())
+
+    print("\nexport example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(1, 6):
+        m.put('key' + str(i), i * 10)
+    found = []
+    print(m.export(lambda key, value: found.append(key + '=' + str(value))), sorted(found))
+    out = io.StringIO()
+    m.export(out, ',')
+    print(sorted(out.getvalue().splitlines()))
+    keys, values = [], array.array('q')
+    m.export((keys, values))
+    print(sorted(keys), sorted(values))
+    values = memoryview(array.array('q', [0] * 3))
+    try:
+        m.export(([], values))
+    except ValueError as error:
+        print(error)
+
+    print("\nsave and load example 1")
+    print("-----------------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(200):
+        m.put('key' + str(i), i * 10)
+    for i in range(0, 200, 3):
+        m.remove('key' + str(i))
+    path = os.path.join(tempfile.gettempdir(), 'hash_map_example.snapshot')
+    m.save(path)
+    loaded = HashMap.load(path, hash_function_1)
+    print(loaded.get_size(), loaded.get_capacity(), loaded.empty_buckets() == m.empty_buckets(),
+          loaded.get_keys_and_values().length(), loaded.get('key199'), loaded.contains_key('key0'))
+    rehashed = HashMap.load(path, hash_function_2) # a different hash function, so every key is hashed again
+    print(rehashed.get_size(), rehashed.get_capacity(), rehashed.get('key199'), rehashed.contains_key('key0'))
+    with open(path, 'r+b') as file: # cut the snapshot short, like a crash in the middle of writing it in place would
+        file.truncate(os.path.getsize(path) // 2)
+    try:
+        HashMap.load(path, hash_function_1)
+    except ValueError as error:
+        print(str(error).replace(path, 'hash_map_example.snapshot'))
+    os.remove(path)
@@ -0,0 +1,276 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using separate chaining
+# Description: This program implements a HashMap class using separate chaining for collision
+# resolution, with the assignment's methods of the HashMap in hash_map_sc.py: put, get, contains_key,
+# remove, resize_table, table_load, empty_buckets, get_keys_and_values and clear. The batch operations,
+# stats and counters, iteration and views, export, and save and load of that HashMap are not implemented
+# here. Instead of a LinkedList of SLNode objects per bucket, each chain is stored inline as one flat
+# list holding the hash, key and value of each of its pairs in turn, and an empty bucket is just None.
+# Creating or resizing the table allocates a single list of buckets, no object is created per key/value
+# pair, and looking a key up walks its chain by index, so it allocates nothing.
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2)
+from capacity_planner import next_prime
+
+# each pair takes this many slots of its chain: its hash, its key and its value
+_STRIDE = 3
+
+
+class HashMap:
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1) -> None:
+        """
+        Initialize new HashMap that uses
+        separate chaining for collision resolution,
+        storing each chain inline in a flat list.
+        """
+        self._capacity = next_prime(capacity) # capacity must be a prime number
+        self._buckets = [None] * self._capacity # None marks an empty bucket
+        self._hash_function = function
+        self._size = 0
+        self._occupied = 0 # number of non-empty buckets, so empty_buckets doesn't have to count them
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            chain = self._buckets[i]
+            pairs = []
+            if chain is not None:
+                for j in range(0, len(chain), _STRIDE):
+                    pairs.append('(' + str(chain[j + 1]) + ': ' + str(chain[j + 2]) + ')')
+            out += str(i) + ': [' + ' -> '.join(pairs) + ']\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates
+        the key/value pair in the hash map. If the given key is not in the hash map, then
+        the given key/value pair is added to the end of its bucket's chain. If the given key
+        already exists in the hash map, then its value is replaced with the given value. If the
+        load factor of the table is greater than or equal to 1, then the capacity is doubled.
+        """
+
+        if self._size >= self._capacity: # if the load factor is greater than 1.0, then double the capacity of the hash table
+            self.resize_table(self._capacity * 2)
+
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        chain = self._buckets[index]
+        if chain is None: # the bucket is empty, so the pair starts a new chain
+            self._buckets[index] = [hash, key, value]
+            self._occupied += 1
+            self._size += 1
+            return
+
+        i = 0
+        length = len(chain)
+        while i < length: # walk the chain, comparing the cached hashes before the keys
+            if chain[i] == hash and chain[i + 1] == key: # the key is already in the hash map, so replace its value
+                chain[i + 2] = value
+                return
+            i += _STRIDE
+
+        chain.append(hash)
+        chain.append(key)
+        chain.append(value)
+        self._size += 1
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as its parameter. The method changes the hash table's
+        underlying capacity, moving every key/value pair into the chains of the new table using
+        their cached hashes. If the given new capacity is less than 1, then the method does
+        nothing. Otherwise the capacity is made a prime number (a capacity of 2 is used as it is),
+        and doubled for as long as the load factor would still be above 1.
+        """
+
+        if new_capacity < 1: # if the given capacity is less than 1, then don't do anything
+            return
+
+        new_capacity = self._resized_capacity(new_capacity)
+        while self._size > new_capacity: # the table still has to hold every pair with a load factor below 1, just like put would
+            new_capacity = self._resized_capacity(new_capacity * 2)
+
+        buckets = [None] * new_capacity
+        occupied = 0
+        for chain in self._buckets:
+            if chain is None:
+                continue
+            for i in range(0, len(chain), _STRIDE): # the pairs keep their keys' hashes, so no key is hashed again
+                hash = chain[i]
+                index = hash % new_capacity
+                new_chain = buckets[index]
+                if new_chain is None:
+                    buckets[index] = chain[i:i + _STRIDE]
+                    occupied += 1
+                else:
+                    new_chain.extend(chain[i:i + _STRIDE])
+
+        self._buckets = buckets
+        self._capacity = new_capacity
+        self._occupied = occupied
+
+    @staticmethod
+    def _resized_capacity(new_capacity: int) -> int:
+        """
+        This method takes a requested capacity as its parameter. The method returns
+        the capacity that resize_table will use, which is the next prime number. A
+        requested capacity of 2 is an edge case and is used as it is.
+        """
+        if new_capacity == 2:
+            return new_capacity
+        return next_prime(new_capacity)
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor. The load factor is the hash table's current size divided by its
+        current capacity.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty buckets that are currently in the hash table.
+        """
+        return self._capacity - self._occupied
+
+    def _find(self, key: str, chain: list, hash: int) -> int:
+        """
+        This method takes a key, a chain and the key's hash as its parameters. The method returns
+        the index in the chain where the given key's pair starts, or -1 if the key isn't in the
+        chain. The cached hashes are compared before the keys.
+        """
+        if chain is None:
+            return -1
+        i = 0
+        length = len(chain)
+        while i < length:
+            if chain[i] == hash and chain[i + 1] == key:
+                return i
+            i += _STRIDE
+        return -1
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None.
+        """
+        hash = self._hash_function(key)
+        chain = self._buckets[hash % self._capacity]
+        i = self._find(key, chain, hash)
+        if i == -1:
+            return None
+        return chain[i + 2]
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        hash = self._hash_function(key)
+        return self._find(key, self._buckets[hash % self._capacity], hash) != -1
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value from its chain. A chain
+        that becomes empty is dropped, leaving None in its bucket. If the given key does not
+        exist in the hash map, then the method does nothing.
+        """
+        hash = self._hash_function(key)
+        index = hash % self._capacity
+        chain = self._buckets[index]
+        i = self._find(key, chain, hash)
+        if i == -1:
+            return
+        del chain[i:i + _STRIDE]
+        if not chain: # the bucket has just become empty
+            self._buckets[index] = None
+            self._occupied -= 1
+        self._size -= 1
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map.
+        """
+        pairs = []
+        for chain in self._buckets:
+            if chain is not None:
+                for i in range(0, len(chain), _STRIDE):
+                    pairs.append((chain[i + 1], chain[i + 2]))
+        return DynamicArray(pairs)
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears the content that is
+        currently in the hash map. The method does not change the hash table's
+        underlying capacity.
+        """
+        self._buckets = [None] * self._capacity
+        self._size = 0
+        self._occupied = 0
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example 1")
+    print("-------------")
+    m = HashMap(53, hash_function_1)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.empty_buckets(), round(m.table_load(), 2), m.get_size(), m.get_capacity())
+
+    print("\nresize example 1")
+    print("----------------")
+    m = HashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.get_size(), m.get_capacity())
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+        result = True
+        for key in keys:
+            # all inserted keys must be present
+            result &= m.contains_key(str(key))
+            # NOT inserted keys must be absent
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nremove and get_keys_and_values example 1")
+    print("----------------------------------------")
+    m = HashMap(11, hash_function_2)
+    for i in range(1, 6):
+        m.put(str(i), str(i * 10))
+    m.remove('1')
+    m.put('2', '200')
+    print(m.get_keys_and_values())
+    m.resize_table(2)
+    print(m.get_keys_and_values(), m.get_capacity(), m.empty_buckets())
+    print(m)
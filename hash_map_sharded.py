@@ -0,0 +1,386 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a sharded HashMap
+# Description: This program implements a ShardedHashMap class, which splits its keys by hash
+# between a number of independent shards. Each shard is a separate chaining or open addressing
+# HashMap. Because the shards share nothing, a large map can be built with one worker process
+# per shard: build hashes and partitions the pairs in parallel in forked workers that share the
+# pairs, builds every shard in its own process from those hashes, and sends back each shard's bucket
+# layout as arrays of bucket indices, hashes and positions in the pairs, which this process turns
+# back into the shard without hashing a key or receiving a key or value. get_many can likewise split a large batch of keys
+# between worker processes. The hash function has to give the same hash for a key in every process,
+# so the default is hash_function_blake2b, and hash_function_builtin is refused.
+
+import multiprocessing
+import os
+import pickle
+from array import array
+from operator import itemgetter
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_blake2b,
+                        hash_function_builtin)
+import hash_map_oa
+import hash_map_sc
+from snapshot import integer_column
+
+# multiplied into a key's hash to pick its shard, so the shard doesn't depend on
+# the same low bits of the hash that the shard's own HashMap picks a bucket with
+_SPREAD = 2654435761
+
+# get_many only hands a batch to worker processes when it has at least this many keys per process
+PARALLEL_MIN_KEYS = 10000
+
+# the shards of the map whose get_many is running, inherited by its forked worker processes
+_forked_map = None
+
+# the pairs that build is building from, in each of its worker processes
+_build_pairs = None
+
+
+def _shard_index(hash: int, shards: int) -> int:
+    """Return the shard that a key with the given hash belongs to."""
+    return (hash * _SPREAD >> 16) % shards
+
+
+def _set_build_pairs(pairs: list) -> None:
+    """
+    Worker process initializer: keep the pairs that build is building
+    from. Forked workers inherit the list instead of having it pickled.
+    """
+    global _build_pairs
+    _build_pairs = pairs
+
+
+def _split(pairs: list, start: int, stop: int, shards: int, function: callable) -> list:
+    """
+    Hash the pairs from start to stop and split them by shard. Return,
+    for each shard, the positions of its pairs in the list and their
+    hashes, as compact integer columns.
+    """
+    positions = [[] for _ in range(shards)]
+    hashes = [[] for _ in range(shards)]
+    add_positions = [shard_positions.append for shard_positions in positions]
+    add_hashes = [shard_hashes.append for shard_hashes in hashes]
+    for position, hash in enumerate(map(function, map(itemgetter(0), pairs[start:stop])), start):
+        shard = (hash * _SPREAD >> 16) % shards # _shard_index, inlined for the hot loop
+        add_positions[shard](position)
+        add_hashes[shard](hash)
+    return [(array('Q', shard_positions), integer_column(shard_hashes))
+            for shard_positions, shard_hashes in zip(positions, hashes)]
+
+
+def _partition(job: tuple) -> list:
+    """
+    Worker process: split one range of the pairs by shard, and
+    return the positions and hashes of each shard's pairs.
+    """
+    start, stop, shards, function = job
+    return _split(_build_pairs, start, stop, shards, function)
+
+
+def _join_columns(columns: list):
+    """
+    Join integer columns made by integer_column into one, which
+    is an array unless one of them is a list.
+    """
+    if all(isinstance(column, array) for column in columns):
+        joined = array('Q')
+        for column in columns:
+            joined.extend(column)
+        return joined
+    return [value for column in columns for value in column]
+
+
+def _build_shard(job: tuple) -> tuple:
+    """
+    Worker process: build one shard from the positions and hashes of
+    its pairs, without hashing a key again, and return its capacity,
+    minimum capacity and bucket layout. Each key is put with its
+    position as its value, so the layout holds positions in place of
+    the keys and values, which this process already has.
+    """
+    positions, hashes, map_class, function = job
+    pairs = _build_pairs
+    numbered = [(pairs[position][0], position) for position in positions]
+    shard = map_class(1, function, expected_size=len(numbered))
+    shard._put_hashed(numbered, hashes)
+    indices, hashes, _, positions, tombstones = shard._layout()
+    return (shard.get_capacity(), shard._min_capacity, array('Q', indices), integer_column(hashes),
+            array('Q', positions), tombstones)
+
+
+def _rebuild_shard(map_class: type, function: callable, pairs: list, built: tuple):
+    """
+    Turn the capacity, minimum capacity and bucket layout sent back
+    by _build_shard into the shard, taking the keys and values from
+    the pairs, without hashing a key.
+    """
+    capacity, min_capacity, indices, hashes, positions, tombstones = built
+    chosen = list(map(pairs.__getitem__, positions))
+    keys = list(map(itemgetter(0), chosen))
+    values = list(map(itemgetter(1), chosen))
+    return map_class._from_layout(function, capacity, min_capacity, {}, indices, hashes, keys, values, tombstones)
+
+
+def _get_chunk(keys: list) -> list:
+    """
+    Forked worker process: look up a chunk of keys in the shards
+    of the map that was being read when the process was forked.
+    """
+    return _forked_map._get_list(keys)
+
+
+class ShardedHashMap:
+    def __init__(self, shards: int = 4, map_class: type = hash_map_sc.HashMap,
+                 function: callable = hash_function_blake2b, capacity: int = 11) -> None:
+        """
+        Initialize new HashMap made of the given number of
+        shards. Each shard is a map_class (the separate chaining
+        or open addressing HashMap) of the given capacity, using
+        the given hash function.
+        """
+        if shards < 1:
+            raise ValueError('a ShardedHashMap needs at least 1 shard')
+        self._hash_function = function
+        self._shards = [map_class(capacity, function) for _ in range(shards)]
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i, shard in enumerate(self._shards):
+            out += 'shard ' + str(i) + ':\n' + str(shard)
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return sum(shard.get_size() for shard in self._shards)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map, the total capacity of its shards
+        """
+        return sum(shard.get_capacity() for shard in self._shards)
+
+    def get_shards(self) -> list:
+        """
+        Return the list of shards
+        """
+        return self._shards
+
+    # ------------------------------------------------------------------ #
+
+    def _shard_for(self, key: str):
+        """
+        This method takes a key as its parameter. The method returns the shard that the key belongs to.
+        """
+        return self._shards[_shard_index(self._hash_function(key), len(self._shards))]
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates
+        the key/value pair in the key's shard. If the given key is not in the hash map, then
+        the given key/value pair is added. If the given key already exists in the hash map,
+        then its value is replaced with the given value. Each shard resizes its own table.
+        """
+        self._shard_for(key).put(key, value)
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None.
+        """
+        return self._shard_for(key).get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        return self._shard_for(key).contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value from its shard. If the
+        given key does not exist in the hash map, then the method does nothing.
+        """
+        self._shard_for(key).remove(key)
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor, which is the total size of the shards divided by their total capacity.
+        """
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty buckets that are currently in all the shards.
+        """
+        return sum(shard.empty_buckets() for shard in self._shards)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map. The pairs are grouped by shard.
+        """
+        pairs = []
+        for shard in self._shards:
+            pairs.extend(shard.items())
+        return DynamicArray(pairs)
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears every shard. The method
+        does not change the underlying capacity of the shards.
+        """
+        for shard in self._shards:
+            shard.clear()
+
+    @staticmethod
+    def _check_function(function: callable) -> None:
+        """
+        This method takes a hash function as its parameter. The method raises a ValueError
+        if the hash function can't be used by worker processes: it has to be picklable, and
+        it has to give a key the same hash in every process, which rules out the builtin hash.
+        """
+        if function is hash_function_builtin:
+            raise ValueError('hash_function_builtin gives different hashes in every process, '
+                             'use hash_function_blake2b or a SeededHashFunction')
+        try:
+            pickle.dumps(function)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            raise ValueError('the hash function must be picklable to be sent to worker processes')
+
+    @classmethod
+    def build(cls, pairs, shards: int = None, processes: int = None,
+              map_class: type = hash_map_sc.HashMap,
+              function: callable = hash_function_blake2b) -> "ShardedHashMap":
+        """
+        This method takes an iterable of key/value pairs, the number of shards, the number of
+        worker processes, the HashMap class of the shards and a hash function as its parameters.
+        The method returns a new ShardedHashMap holding the given pairs, built in parallel. The
+        worker processes are forked where they can be, so they share the pairs with this process
+        instead of having them pickled. The pairs are split into one range per process, and each
+        worker hashes its range and sends back the positions and hashes of each shard's pairs as
+        compact arrays. Then each shard is built by its own worker from those hashes, with its
+        capacity chosen up front, and its bucket layout is sent back as arrays of bucket indices,
+        hashes and positions, so this process only has to link the pairs into their buckets. No
+        key is hashed twice, and no key or value is sent between processes. Both the number of
+        processes and the number of shards default to the number of CPUs. With a single process,
+        everything is done in this process instead.
+        """
+        cls._check_function(function)
+        processes = processes or os.cpu_count() or 1
+        shards = shards or processes
+        if not isinstance(pairs, list):
+            pairs = list(pairs)
+
+        hash_map = cls(shards, map_class, function)
+        if processes == 1:
+            for s, (positions, hashes) in enumerate(_split(pairs, 0, len(pairs), shards, function)):
+                shard_pairs = list(map(pairs.__getitem__, positions)) # the shards are built right here, so there is no layout to send back
+                shard = map_class(1, function, expected_size=len(shard_pairs))
+                shard._put_hashed(shard_pairs, hashes)
+                hash_map._shards[s] = shard
+            return hash_map
+
+        step = -(-len(pairs) // processes) or 1 # ceiling division, so there are at most processes ranges
+        ranges = [(i, min(i + step, len(pairs)), shards, function) for i in range(0, len(pairs), step)]
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        else: # the pairs are pickled and sent to each worker once instead
+            context = multiprocessing.get_context()
+        with context.Pool(processes, _set_build_pairs, (pairs,)) as pool:
+            parts = pool.map(_partition, ranges)
+            built = pool.map(_build_shard, [(_join_columns([part[s][0] for part in parts]),
+                                             _join_columns([part[s][1] for part in parts]), map_class, function)
+                                            for s in range(shards)])
+        hash_map._shards = [_rebuild_shard(map_class, function, pairs, layout) for layout in built]
+        return hash_map
+
+    def _get_list(self, keys: list) -> list:
+        """
+        This method takes a list of keys as its parameter. The method returns a list holding
+        the value of each key, in the same order as the keys, or None for a missing key.
+        """
+        shards = self._shards
+        count = len(shards)
+        function = self._hash_function
+        return [shards[_shard_index(function(key), count)].get(key) for key in keys]
+
+    def get_many(self, keys, processes: int = None) -> DynamicArray:
+        """
+        This method takes an iterable of keys, and optionally a number of worker processes, as
+        its parameters. The method returns a DynamicArray holding the value associated with each
+        key, in the same order as the keys. A key that is not in the hash map gets None, just
+        like get. If there are enough keys, then they are split into one chunk per process and
+        looked up by forked worker processes, which share the shards with this process instead
+        of having them copied. Where processes can't be forked, the keys are looked up here.
+        """
+        global _forked_map
+        if not isinstance(keys, list):
+            keys = list(keys)
+        processes = processes or os.cpu_count() or 1
+        if (processes == 1 or len(keys) < PARALLEL_MIN_KEYS * processes
+                or 'fork' not in multiprocessing.get_all_start_methods()):
+            return DynamicArray(self._get_list(keys))
+
+        step = -(-len(keys) // processes)
+        _forked_map = self # the forked workers see the shards as they are now
+        try:
+            with multiprocessing.get_context('fork').Pool(processes) as pool:
+                chunks = pool.map(_get_chunk, [keys[i:i + step] for i in range(0, len(keys), step)])
+        finally:
+            _forked_map = None
+        return DynamicArray([value for chunk in chunks for value in chunk])
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nput example 1")
+    print("-------------")
+    m = ShardedHashMap(4)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+        if i % 25 == 24:
+            print(m.get_size(), m.get_capacity(), [shard.get_size() for shard in m.get_shards()])
+    print(m.get('str42'), m.contains_key('str150'))
+    m.remove('str42')
+    print(m.get('str42'), m.get_size())
+
+    print("\nbuild example 1")
+    print("---------------")
+    pairs = [('key' + str(i), i) for i in range(100000)]
+    for map_class in (hash_map_sc.HashMap, hash_map_oa.HashMap):
+        m = ShardedHashMap.build(pairs, shards=4, processes=2, map_class=map_class)
+        values = m.get_many(['key' + str(i) for i in range(0, 100000, 2)] + ['missing'], processes=2)
+        result = True
+        for i in range(values.length() - 1):
+            result &= values[i] == i * 2
+        print(m.get_size(), [shard.get_size() for shard in m.get_shards()], result, values[values.length() - 1])
+
+    print("\nbuild example 2")
+    print("---------------")
+    try:
+        ShardedHashMap.build(pairs, function=hash_function_builtin)
+    except ValueError as error:
+        print(error)
+    m = ShardedHashMap.build(pairs[:10], shards=2, processes=1, function=hash_function_1)
+    print(m.get_size(), m.get('key7'))
+
+    print("\nbuild example 3")
+    print("---------------")
+    # hash_function_1 gives the keys only a few hundred hashes, so the chains are hundreds of nodes long
+    m = ShardedHashMap.build(pairs[:20000], shards=2, processes=2, function=hash_function_1)
+    print(m.get_size(), max(shard.stats()['max_chain_length'] for shard in m.get_shards()), m.get('key19999'))
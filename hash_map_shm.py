@@ -0,0 +1,303 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using open addressing
+# Description: This program implements a read-only SharedHashMap class, an open addressing hash
+# table that lives in a single block of shared memory (multiprocessing.shared_memory). One process
+# builds the table, and any number of other processes attach to it by name and call get and
+# contains_key on it directly, without copying it or creating a Python object per key/value pair.
+# The block holds a header, a slot array of fixed-width (hash, offset) slots, and a blob area with
+# each key (as UTF-8) and value (pickled) packed one after another. Collisions are resolved with the
+# same quadratic probing as the HashMap in hash_map_oa.py, over a prime capacity at least twice the
+# number of keys. The hash function has to give the same hash for a key in every process, so the
+# default is hash_function_blake2b.
+
+import pickle
+import struct
+import sys
+from multiprocessing import resource_tracker, shared_memory
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_blake2b,
+                        hash_function_builtin)
+from capacity_planner import next_prime
+
+_MAGIC = b'HMSHM001'
+_MASK_64 = (1 << 64) - 1
+
+# magic, capacity, size, hash of _CHECK_KEY under the hash function the table was built with
+_HEADER = struct.Struct('<8sQQQ')
+# a key's hash, and the offset of its entry in the blob area (0 marks an empty slot)
+_SLOT = struct.Struct('<QQ')
+# the lengths of an entry's key and value, which are stored right after them
+_ENTRY = struct.Struct('<II')
+
+# hashed when the table is built and again when it is attached, to catch a different hash function
+_CHECK_KEY = 'SharedHashMap'
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing shared memory block without registering it with this process's
+    resource tracker. Otherwise, before Python 3.13, the tracker would unlink the block
+    when this process exits, while the process that built it still needs it.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name, track=False)
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name)
+    finally:
+        resource_tracker.register = register
+
+
+class SharedHashMap:
+    def __init__(self, shm: shared_memory.SharedMemory, function: callable, owner: bool) -> None:
+        """
+        Initialize new SharedHashMap over a block of shared memory
+        holding a table. Use build to create the table, or attach
+        to open a table that another process has built.
+        """
+        self._shm = shm
+        self._buf = shm.buf
+        self._hash_function = function
+        self._owner = owner # only the process that built the table unlinks it
+
+        magic, self._capacity, self._size, check = _HEADER.unpack_from(self._buf, 0)
+        error = None
+        if magic != _MAGIC:
+            error = 'shared memory block ' + shm.name + ' does not hold a SharedHashMap'
+        elif function(_CHECK_KEY) & _MASK_64 != check:
+            error = 'the table was built with a different hash function'
+        if error is not None:
+            self.close() # don't leave the block attached
+            raise ValueError(error)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        out = ''
+        for i in range(self._capacity):
+            offset = _SLOT.unpack_from(self._buf, _HEADER.size + i * _SLOT.size)[1]
+            out += str(i) + ': ' + (str(self._read_entry(offset)) if offset else 'None') + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._capacity
+
+    def get_name(self) -> str:
+        """
+        Return the name of the shared memory block, which other processes attach with
+        """
+        return self._shm.name
+
+    # ------------------------------------------------------------------ #
+
+    @classmethod
+    def build(cls, pairs, function: callable = hash_function_blake2b, name: str = None) -> "SharedHashMap":
+        """
+        This method takes an iterable of key/value pairs, a hash function and optionally a name
+        for the shared memory block as its parameters. The method creates a shared memory block
+        just big enough for a table of the given pairs, writes the table into it, and returns the
+        SharedHashMap. The keys must be strings, and the values must be picklable. If a key appears
+        more than once, then its last value is kept, just like put. The hash function must give
+        a key the same hash in every process, so hash_function_builtin can't be used.
+        """
+        if function is hash_function_builtin:
+            raise ValueError('hash_function_builtin gives different hashes in every process, '
+                             'use hash_function_blake2b or a SeededHashFunction')
+
+        entries = [] # the hash, encoded key and pickled value of each pair
+        blob_size = 0
+        for key, value in pairs:
+            key_bytes = key.encode('utf-8')
+            value_bytes = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+            entries.append((function(key) & _MASK_64, key_bytes, value_bytes))
+            blob_size += _ENTRY.size + len(key_bytes) + len(value_bytes)
+
+        capacity = next_prime(2 * len(entries)) # keep the load factor at or below 0.5, just like the open addressing HashMap
+        blob_start = _HEADER.size + capacity * _SLOT.size
+        shm = shared_memory.SharedMemory(name, create=True, size=blob_start + blob_size)
+        buf = shm.buf
+        buf[_HEADER.size:blob_start] = bytes(capacity * _SLOT.size) # every slot starts out empty
+
+        size = 0
+        offset = blob_start
+        for hash, key_bytes, value_bytes in entries:
+            # pack the entry into the blob area
+            _ENTRY.pack_into(buf, offset, len(key_bytes), len(value_bytes))
+            key_start = offset + _ENTRY.size
+            buf[key_start:key_start + len(key_bytes)] = key_bytes
+            buf[key_start + len(key_bytes):key_start + len(key_bytes) + len(value_bytes)] = value_bytes
+
+            # follow the key's probe sequence to an empty slot, or to the slot of the same key
+            i_initial = hash % capacity
+            j = 0
+            quad_probe = i_initial
+            while True:
+                slot_hash, slot_offset = _SLOT.unpack_from(buf, _HEADER.size + quad_probe * _SLOT.size)
+                if slot_offset == 0:
+                    size += 1
+                    break
+                if slot_hash == hash and cls._key_at(buf, slot_offset) == key_bytes: # a repeated key, so its slot now points at the new value
+                    break
+                j += 1
+                quad_probe = (i_initial + (j ** 2)) % capacity
+            _SLOT.pack_into(buf, _HEADER.size + quad_probe * _SLOT.size, hash, offset)
+            offset = key_start + len(key_bytes) + len(value_bytes)
+
+        _HEADER.pack_into(buf, 0, _MAGIC, capacity, size, function(_CHECK_KEY) & _MASK_64)
+        return cls(shm, function, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, function: callable = hash_function_blake2b) -> "SharedHashMap":
+        """
+        This method takes the name of a shared memory block, and the hash function the table was
+        built with, as its parameters. The method returns a SharedHashMap reading the table in
+        place. Nothing is copied, so attaching takes the same time however big the table is. A
+        ValueError is raised if the hash function isn't the one the table was built with.
+        """
+        return cls(_attach_shared_memory(name), function, owner=False)
+
+    @staticmethod
+    def _key_at(buf: memoryview, offset: int) -> memoryview:
+        """
+        This method takes the buffer and the offset of an entry as its parameters.
+        The method returns a view of the entry's encoded key, without copying it.
+        """
+        key_length = _ENTRY.unpack_from(buf, offset)[0]
+        return buf[offset + _ENTRY.size:offset + _ENTRY.size + key_length]
+
+    def _read_entry(self, offset: int) -> tuple:
+        """
+        This method takes the offset of an entry as its parameter. The method
+        returns the entry's key and value as a tuple.
+        """
+        key_length, value_length = _ENTRY.unpack_from(self._buf, offset)
+        key_start = offset + _ENTRY.size
+        value_start = key_start + key_length
+        return (str(self._buf[key_start:value_start], 'utf-8'),
+                pickle.loads(self._buf[value_start:value_start + value_length]))
+
+    def _find_offset(self, key: str) -> int:
+        """
+        This method takes a key as its parameter. The method follows the key's probe sequence
+        and returns the offset of the key's entry, or 0 if the key isn't in the table. The
+        stored hashes are compared first, so only a key with the same hash is read.
+        """
+        buf = self._buf
+        capacity = self._capacity
+        hash = self._hash_function(key) & _MASK_64
+        key_bytes = key.encode('utf-8')
+        i_initial = hash % capacity
+        j = 0
+        quad_probe = i_initial
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(buf, _HEADER.size + quad_probe * _SLOT.size)
+            if offset == 0: # an empty slot ends the probe sequence
+                return 0
+            if slot_hash == hash and self._key_at(buf, offset) == key_bytes:
+                return offset
+            j += 1
+            quad_probe = (i_initial + (j ** 2)) % capacity
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key, unpickled straight out of shared memory.
+        If the given key is not in the hash map, then the method returns None.
+        """
+        offset = self._find_offset(key)
+        if offset == 0:
+            return None
+        key_length, value_length = _ENTRY.unpack_from(self._buf, offset)
+        value_start = offset + _ENTRY.size + key_length
+        return pickle.loads(self._buf[value_start:value_start + value_length])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        return self._find_offset(key) != 0
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current
+        load factor. The load factor is the hash table's size divided by its capacity.
+        """
+        return self._size / self._capacity
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty slots in the hash table.
+        """
+        slots = self._buf[_HEADER.size:_HEADER.size + self._capacity * _SLOT.size]
+        return sum(1 for _, offset in _SLOT.iter_unpack(slots) if offset == 0)
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are stored in
+        the hash map. The keys and values are copied out of shared memory.
+        """
+        slots = self._buf[_HEADER.size:_HEADER.size + self._capacity * _SLOT.size]
+        return DynamicArray([self._read_entry(offset) for _, offset in _SLOT.iter_unpack(slots) if offset != 0])
+
+    def close(self) -> None:
+        """
+        This method takes no parameters. The method detaches this process from the
+        shared memory block. The SharedHashMap can't be used after it is closed.
+        """
+        self._buf = None
+        self._shm.close()
+
+    def unlink(self) -> None:
+        """
+        This method takes no parameters. The method closes the SharedHashMap and, if this
+        process built the table, frees the shared memory block once every process that
+        attached to it has closed it too.
+        """
+        self.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nbuild example 1")
+    print("---------------")
+    m = SharedHashMap.build([('key' + str(i), i * 10) for i in range(1000)] + [('key7', 'seven')])
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.empty_buckets())
+    print(m.get('key42'), m.get('key7'), m.get('key1000'), m.contains_key('key999'))
+
+    print("\nattach example 1")
+    print("----------------")
+    other = SharedHashMap.attach(m.get_name())
+    print(other.get_size(), other.get('key42'), other.contains_key('missing'))
+    other.close()
+    try:
+        SharedHashMap.attach(m.get_name(), hash_function_1)
+    except ValueError as error:
+        print(error)
+    m.unlink()
+
+    print("\nget_keys_and_values example 1")
+    print("-----------------------------")
+    m = SharedHashMap.build([(str(i), [i] * i) for i in range(1, 4)], hash_function_1)
+    print(m.get_keys_and_values())
+    print(m)
+    m.unlink()
@@ -0,0 +1,335 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Implementing a HashMap class using separate chaining
+# Description: This program implements a DurableHashMap class, which keeps a separate chaining
+# HashMap from hash_map_sc.py in memory and survives a crash. Every put, remove and clear is applied
+# to the map and then, before it returns, appended to a write-ahead log file in a directory, as a
+# record holding its length, a CRC32 checksum and the pickled operation. An operation the map rejects
+# is never logged. Every record is flushed to the operating system before the operation returns,
+# so a crash of the process alone loses nothing. The log is then synced to disk after every record,
+# after every batch of records (group commit), or only when the operating system gets to it,
+# depending on the durability level, which decides what survives a power loss. Once the log grows
+# long enough, it is compacted: the map is saved as a snapshot (see snapshot.py) and the log starts
+# over. When a DurableHashMap is opened, the map is loaded from
+# the snapshot and the records in the log are replayed on top of it. A record cut short by a crash
+# fails its checksum or can't be unpickled, so replay stops there and the log is truncated back to
+# its last whole record.
+
+import os
+import pickle
+import shutil
+import struct
+import tempfile
+import zlib
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2)
+from hash_map_sc import HashMap
+from snapshot import sync_directory
+
+# the durability levels: never sync the log, sync it after every batch of records, or after every record
+DURABILITY_LEVELS = ('none', 'batch', 'always')
+
+# the length and CRC32 checksum of the pickled operation that follows
+_RECORD_HEADER = struct.Struct('<II')
+
+# the operations written to the log
+_PUT = 1
+_REMOVE = 2
+_CLEAR = 3
+
+_SNAPSHOT = 'snapshot'
+_LOG = 'wal.log'
+
+
+class DurableHashMap:
+    def __init__(self, directory: str, function: callable = hash_function_1, durability: str = 'batch',
+                 batch_size: int = 64, compact_after: int = 100000) -> None:
+        """
+        Initialize new DurableHashMap that keeps its snapshot and
+        write-ahead log in the given directory, creating it if needed.
+        Whatever the directory already holds is recovered: the snapshot
+        is loaded and the log is replayed on top of it. durability is
+        one of DURABILITY_LEVELS. With 'batch', the log is synced after
+        every batch_size records. The log is compacted into a new
+        snapshot once it holds compact_after records.
+        """
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError('durability must be one of ' + ', '.join(DURABILITY_LEVELS))
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, _SNAPSHOT)
+        self._log_path = os.path.join(directory, _LOG)
+        self._durability = durability
+        self._batch_size = batch_size
+        self._compact_after = compact_after
+        self._unsynced = 0 # records written since the log was last synced
+
+        if os.path.exists(self._snapshot_path):
+            self._map = HashMap.load(self._snapshot_path, function)
+        else:
+            self._map = HashMap(11, function)
+        self._records = self._replay() # number of records in the log
+        created = not os.path.exists(self._log_path)
+        self._log = open(self._log_path, 'ab')
+        if created: # the new log's directory entry has to reach the disk too, or a power loss could take the log with it
+            sync_directory(self._log_path)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        return str(self._map)
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        """
+        return self._map.get_size()
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._map.get_capacity()
+
+    # ------------------------------------------------------------------ #
+
+    def _replay(self) -> int:
+        """
+        This method takes no parameters. The method applies every whole record in the log to the
+        map, and returns how many there were. If the log ends in a record that was cut short, fails
+        its checksum or can't be unpickled, then the log is truncated back to the end of the last
+        whole record, so new records are appended after it. A ValueError naming the record's offset
+        is raised if the map rejects a whole record, or its opcode isn't known, rather than dropping it.
+        """
+        if not os.path.exists(self._log_path):
+            return 0
+        with open(self._log_path, 'rb') as file:
+            data = file.read()
+
+        records = 0
+        offset = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            payload = data[start:start + length]
+            # a torn write at the end of the log, where a zeroed header would pass the checksum of an empty payload
+            if length == 0 or len(payload) < length or zlib.crc32(payload) != checksum:
+                break
+            try:
+                record = pickle.loads(payload)
+            except Exception: # the checksum can't catch everything, and a record that can't be read is torn too
+                break
+            try:
+                self._apply(record)
+            except Exception as error:
+                raise ValueError(self._log_path + ': the record at offset ' + str(offset) + ' could not be replayed') from error
+            records += 1
+            offset = start + length
+
+        if offset < len(data):
+            with open(self._log_path, 'r+b') as file:
+                file.truncate(offset)
+        return records
+
+    def _apply(self, record: tuple) -> None:
+        """
+        This method takes a record read back from the log as its parameter. The method applies it to
+        the map. A ValueError is raised if the record's opcode isn't known.
+        """
+        operation = record[0]
+        if operation == _PUT:
+            self._map.put(record[1], record[2])
+        elif operation == _REMOVE:
+            self._map.remove(record[1])
+        elif operation == _CLEAR:
+            self._map.clear()
+        else:
+            raise ValueError('unknown log opcode ' + repr(operation))
+
+    @staticmethod
+    def _encode(record: tuple) -> bytes:
+        """
+        This method takes a record as its parameter. The method returns the pickled record.
+        """
+        return pickle.dumps(record, pickle.HIGHEST_PROTOCOL)
+
+    def _append(self, payload: bytes) -> None:
+        """
+        This method takes a pickled record as its parameter. The method appends the record to the
+        log and flushes it to the operating system, and syncs the log as the durability level asks.
+        Each operation is applied to the map before it is logged, and logged before it returns, so an
+        operation that the map rejects never reaches the log, where it would fail again every time
+        the log is replayed.
+        """
+        self._log.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload) # one write, so the header and payload go out together
+        self._log.flush() # hand the record to the operating system, so it outlives a crash of this process
+        self._records += 1
+        self._unsynced += 1
+        if self._durability == 'always' or (self._durability == 'batch' and self._unsynced >= self._batch_size):
+            self.sync()
+
+    def _check_compaction(self) -> None:
+        """
+        This method takes no parameters. Once the log holds compact_after records, the method
+        compacts it. It is called after an operation has been applied to the map as well as
+        logged, so the snapshot includes it.
+        """
+        if self._records >= self._compact_after:
+            self.compact()
+
+    def sync(self) -> None:
+        """
+        This method takes no parameters. The method flushes the log and syncs it to disk, so every
+        operation so far survives a power loss. With the 'batch' durability level, call it to commit a
+        partial batch.
+        """
+        self._log.flush()
+        os.fsync(self._log.fileno())
+        self._unsynced = 0
+
+    def compact(self) -> None:
+        """
+        This method takes no parameters. The method saves the map as a new snapshot, and then empties
+        the log. save writes the snapshot to a temporary file, syncs it, renames it over the old one,
+        and syncs the directory (see snapshot.py). A crash leaves either the old or the new snapshot,
+        and the log isn't emptied until the new snapshot is sure to survive a power loss. A crash after
+        the rename but before the log is emptied is safe too: replaying puts, removes and clears on a
+        map that already reflects them leaves it unchanged, since each one just sets where a key ends up.
+        """
+        self._map.save(self._snapshot_path)
+
+        self._log.close()
+        self._log = open(self._log_path, 'wb') # start the log over
+        self.sync()
+        self._records = 0
+
+    def close(self) -> None:
+        """
+        This method takes no parameters. The method syncs the log and closes it. The DurableHashMap
+        can't be changed after it is closed.
+        """
+        self.sync()
+        self._log.close()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and its associated value as parameters. The method updates the
+        key/value pair in the hash map, and then logs the put. If the given key is not in the hash
+        map, then the given key/value pair is added. If the given key already exists in the hash map,
+        then its value is replaced with the given value. The key and value must be picklable. If the
+        put fails, for instance on a key the hash function can't take, then nothing is logged.
+        """
+        payload = self._encode((_PUT, key, value)) # pickled first, so an unpicklable key or value fails before the map changes
+        self._map.put(key, value)
+        self._append(payload)
+        self._check_compaction()
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as its parameter. The method returns the value
+        associated with the given key. If the given key is not in the hash map,
+        then the method returns None.
+        """
+        return self._map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as its parameter. The method returns True if
+        the key is in the hash map, and False if otherwise.
+        """
+        return self._map.contains_key(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as its parameter. If the given key exists in the hash map
+        then the method removes the key and its associated value, and logs the removal. If
+        the given key does not exist in the hash map, then the method does nothing.
+        """
+        if self._map.contains_key(key): # removing a missing key changes nothing, so it isn't logged
+            self._map.remove(key)
+            self._append(self._encode((_REMOVE, key)))
+            self._check_compaction()
+
+    def clear(self) -> None:
+        """
+        This method takes no parameters. The method clears the content that is
+        currently in the hash map, and then logs the clear.
+        """
+        self._map.clear()
+        self._append(self._encode((_CLEAR,)))
+        self._check_compaction()
+
+    def table_load(self) -> float:
+        """
+        This method takes no parameters. The method returns the hash table's current load factor.
+        """
+        return self._map.table_load()
+
+    def empty_buckets(self) -> int:
+        """
+        This method takes no parameters. The method returns the number
+        of empty buckets that are currently in the hash table.
+        """
+        return self._map.empty_buckets()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        This method takes no parameters. The method returns a DynamicArray of tuples,
+        where each tuple contains a key and its associated value, which are currently
+        stored in the hash map.
+        """
+        return self._map.get_keys_and_values()
+
+
+# ------------------- BASIC TESTING ---------------------------------------- #
+
+if __name__ == "__main__":
+
+    print("\nrecovery example 1")
+    print("------------------")
+    directory = tempfile.mkdtemp()
+    m = DurableHashMap(directory, hash_function_2, durability='always')
+    for i in range(1, 6):
+        m.put(str(i), i * 10)
+    m.remove('1')
+    m.put('2', 200)
+    m.close()
+    m = DurableHashMap(directory, hash_function_2)
+    print(m.get_size(), m.get('2'), m.contains_key('1'), m.get_keys_and_values())
+    try:
+        m.put(123, 'not a string key') # hash_function_2 can't hash an int, so the put fails before it is logged
+    except TypeError as error:
+        print(error)
+    m.close()
+    m = DurableHashMap(directory, hash_function_2)
+    print(m.get_size(), m.get('2'))
+
+    print("\ncompaction example 1")
+    print("--------------------")
+    m = DurableHashMap(directory, hash_function_2, durability='batch', compact_after=100)
+    for i in range(250):
+        m.put('key' + str(i), i)
+    m.clear()
+    m.put('after clear', True)
+    m.close()
+    m = DurableHashMap(directory, hash_function_2)
+    print(m.get_size(), m.get('after clear'), m.get('key7'), os.path.getsize(os.path.join(directory, _LOG)) > 0)
+    m.close()
+
+    print("\ntorn write example 1")
+    print("--------------------")
+    with open(os.path.join(directory, _LOG), 'ab') as log:
+        log.write(_RECORD_HEADER.pack(100, 0) + b'cut short') # a record the crash interrupted
+    m = DurableHashMap(directory, hash_function_2)
+    m.put('new', 1)
+    m.close()
+    m = DurableHashMap(directory, hash_function_2)
+    print(m.get_size(), m.get('after clear'), m.get('new'))
+    m.close()
+    with open(os.path.join(directory, _LOG), 'ab') as log:
+        log.write(bytes(4096)) # a file system that zero-fills the end of a file cut short by a power loss
+    m = DurableHashMap(directory, hash_function_2)
+    print(m.get_size(), os.path.getsize(os.path.join(directory, _LOG)) < 4096)
+    m.close()
+    shutil.rmtree(directory)
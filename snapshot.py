@@ -0,0 +1,220 @@
+# Name: Matt Holmstrom
+# OSU Email: holmstrm@oregonstate.edu
+# Course: CS261 - Data Structures
+# Assignment: 6 - Saving and loading the HashMap classes
+# Description: This module reads and writes the snapshot files that the HashMap classes save to
+# and load from. A snapshot is the magic bytes, the length and CRC32 checksum of the body, and the
+# body, which is one pickled dictionary. The checksum is checked before the body is unpickled, so a
+# damaged file is reported rather than loaded with other keys or values. The dictionary holds the kind
+# of hash map, the identity of its hash function, its capacity and options, and its key/value pairs
+# as columns: the bucket index, the stored hash, the key and the value of each pair. The bucket
+# indices and hashes are stored as arrays of 64-bit integers, so loading can put every pair straight
+# back into its bucket without hashing or probing. Before the stored layout is trusted, a sample of
+# the keys is hashed again, since a hash function with the same name can still give other hashes,
+# like the builtin hash in a new process. A snapshot is written to a temporary file first and then
+# renamed over the old one, and the directory is synced, so a crash or power loss while saving leaves
+# either the old or the new snapshot.
+
+import array
+import gc
+import os
+import pickle
+import struct
+import zlib
+from contextlib import contextmanager, suppress
+
+_MAGIC = b'HMSNAP02'
+# the length and CRC32 checksum of the pickled body, which follow the magic bytes
+_BODY_HEADER = struct.Struct('<QI')
+
+# number of keys that are hashed again on load to check the stored hashes
+VERIFY_KEYS = 16
+
+# the fields of a snapshot's dictionary
+_FIELDS = ('kind', 'function', 'capacity', 'min_capacity', 'options', 'indices', 'hashes', 'keys', 'values',
+           'tombstones')
+
+
+def function_identity(function: callable) -> str:
+    """
+    This function takes a hash function as its parameter. The function returns a string naming
+    it: its module and qualified name, or for a callable object such as a SeededHashFunction,
+    its module and repr, which includes its seed.
+    """
+    name = getattr(function, '__qualname__', None)
+    if name is None: # a callable object rather than a function
+        return type(function).__module__ + '.' + repr(function)
+    return function.__module__ + '.' + name
+
+
+def integer_column(values: list):
+    """
+    This function takes a list of non-negative integers as its parameter. The function returns
+    them as an array of 64-bit integers, which pickles as one block of bytes, or as the list itself
+    if one of them doesn't fit.
+    """
+    try:
+        return array.array('Q', values)
+    except OverflowError: # a negative hash, or one wider than 64 bits
+        return values
+
+
+@contextmanager
+def collection_paused():
+    """
+    This function is a context manager that turns the garbage collector off inside the with
+    block, and back on afterwards if it was on. Loading a snapshot creates an object for every
+    key/value pair, none of which can be garbage, and otherwise the collector would walk all
+    of them again and again while they are created.
+    """
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+
+def sync_directory(path: str) -> None:
+    """
+    This function takes the path of a file as its parameter. The function syncs the directory holding
+    the file to disk. Syncing a file only saves its contents, so this is what makes creating, renaming
+    or replacing the file survive a power loss. Windows can't open a directory, so there the function
+    does nothing.
+    """
+    if os.name == 'nt':
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def write_snapshot(path: str, kind: str, function: callable, capacity: int, min_capacity: int, options: dict,
+                   indices: list, hashes: list, keys: list, values: list, tombstones: list = ()) -> None:
+    """
+    This function takes the path to write to, the kind of hash map, its hash function, capacity,
+    minimum capacity and constructor options, and the columns of its key/value pairs as its
+    parameters. The function writes the snapshot file. tombstones holds the bucket indices of an
+    open addressing table's tombstones, which the probe sequences of other keys may pass through.
+    The snapshot is written to a temporary file next to the given path and synced to disk, and
+    then renamed over the path in a single step, so the path never holds a partly written snapshot.
+    Once the function returns, the rename has been synced to disk as well.
+    """
+    snapshot = {
+        'kind': kind,
+        'function': function_identity(function),
+        'capacity': capacity,
+        'min_capacity': min_capacity,
+        'options': options,
+        'indices': integer_column(indices),
+        'hashes': integer_column(hashes),
+        'keys': keys,
+        'values': values,
+        'tombstones': integer_column(list(tombstones)),
+    }
+    temporary_path = path + '.tmp'
+    try:
+        body = pickle.dumps(snapshot, pickle.HIGHEST_PROTOCOL) # pickled first, since the checksum goes in front of it
+        with open(temporary_path, 'wb') as file:
+            file.write(_MAGIC + _BODY_HEADER.pack(len(body), zlib.crc32(body)))
+            file.write(body)
+            file.flush()
+            os.fsync(file.fileno())
+    except BaseException: # a key or value that can't be pickled, or a full disk, leaves the old snapshot alone
+        with suppress(FileNotFoundError): # open() itself may have failed, and its error is the one to report
+            os.remove(temporary_path)
+        raise
+    os.replace(temporary_path, path)
+    sync_directory(path)
+
+
+def read_snapshot(path: str, kind: str, options: dict) -> dict:
+    """
+    This function takes the path of a snapshot file, the kind of hash map loading it, and the
+    constructor options that hash map takes, as a dictionary of each option's name and type or
+    tuple of types, as its parameters. The function returns the snapshot's dictionary. A ValueError
+    is raised if the file isn't a snapshot, is truncated or corrupt, or was saved by another kind of
+    hash map. The body's length and checksum are checked before it is unpickled, and the fields are
+    checked before the hash map uses them.
+    """
+    with open(path, 'rb') as file:
+        if file.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(path + ' is not a HashMap snapshot')
+        header = file.read(_BODY_HEADER.size)
+        if len(header) < _BODY_HEADER.size:
+            raise ValueError(path + ' is a truncated HashMap snapshot')
+        length, checksum = _BODY_HEADER.unpack(header)
+        if length != os.fstat(file.fileno()).st_size - file.tell(): # checked first, so a damaged length can't make the read run out of memory
+            raise ValueError(path + ' is a truncated or corrupt HashMap snapshot, its length doesn\'t match')
+        body = file.read(length)
+    if zlib.crc32(body) != checksum:
+        raise ValueError(path + ' is a corrupt HashMap snapshot, it fails its checksum')
+    try:
+        snapshot = pickle.loads(body)
+    except Exception as error: # the checksum can't catch everything, and unpickling damaged data can raise almost anything
+        raise ValueError(path + ' is a corrupt HashMap snapshot') from error
+
+    _check_fields(path, snapshot, options)
+    if snapshot['kind'] != kind:
+        raise ValueError(path + ' holds a ' + snapshot['kind'] + ' HashMap, not a ' + kind + ' HashMap')
+    return snapshot
+
+
+def _is_integer_column(column) -> bool:
+    """
+    This function takes a column of a snapshot as its parameter. The function returns True if it
+    is a column of integers as integer_column makes it: an array of 64-bit integers, or a list of
+    integers.
+    """
+    if isinstance(column, array.array):
+        return column.typecode == 'Q'
+    return isinstance(column, list) and all(type(value) is int for value in column)
+
+
+def _check_fields(path: str, snapshot: object, options: dict) -> None:
+    """
+    This function takes the path of a snapshot file, its unpickled dictionary, and the constructor
+    options of the hash map loading it as its parameters. The function raises a ValueError if a
+    field is missing or has the wrong type, an option isn't one the hash map takes, or the columns
+    don't match each other or the capacity.
+    """
+    if not isinstance(snapshot, dict) or any(field not in snapshot for field in _FIELDS):
+        raise ValueError(path + ' is a corrupt HashMap snapshot, it is missing fields')
+    capacity, min_capacity = snapshot['capacity'], snapshot['min_capacity']
+    if (not isinstance(snapshot['kind'], str) or not isinstance(snapshot['function'], str) or
+            type(capacity) is not int or capacity < 1 or type(min_capacity) is not int or
+            not isinstance(snapshot['options'], dict)):
+        raise ValueError(path + ' is a corrupt HashMap snapshot, its fields have the wrong types')
+    for name, value in snapshot['options'].items():
+        if name not in options or not isinstance(value, options[name]):
+            raise ValueError(path + ' is a corrupt HashMap snapshot, it has a bad option ' + repr(name))
+
+    indices, hashes, keys, values = snapshot['indices'], snapshot['hashes'], snapshot['keys'], snapshot['values']
+    tombstones = snapshot['tombstones']
+    if (not isinstance(keys, list) or not isinstance(values, list) or not _is_integer_column(indices) or
+            not _is_integer_column(hashes) or not _is_integer_column(tombstones)):
+        raise ValueError(path + ' is a corrupt HashMap snapshot, its columns have the wrong types')
+    if (len(set(map(len, (indices, hashes, keys, values)))) != 1 or
+            min(indices, default=0) < 0 or max(indices, default=-1) >= capacity or
+            min(tombstones, default=0) < 0 or max(tombstones, default=-1) >= capacity):
+        raise ValueError(path + ' is a corrupt HashMap snapshot, its columns don\'t match its capacity')
+
+
+def layout_is_valid(snapshot: dict, function: callable) -> bool:
+    """
+    This function takes a snapshot's dictionary and the hash function it is being loaded with as its
+    parameters. The function returns True if the stored bucket layout can be used as it is: the hash
+    function has the same identity as the one the snapshot was saved with, and it gives the stored
+    hash for a sample of keys spread over the snapshot.
+    """
+    if snapshot['function'] != function_identity(function):
+        return False
+    keys, hashes = snapshot['keys'], snapshot['hashes']
+    step = max(len(keys) // VERIFY_KEYS, 1)
+    for i in range(0, len(keys), step):
+        if function(keys[i]) != hashes[i]:
+            return False
+    return True